@@ -20,11 +20,12 @@ led = Pin("LED", Pin.OUT)
 
 # Hold-detect logic (1 second continuous press)
 held = True
-for _ in range(10):  # check for ~1.0s (10×100ms)
-    if btn.value() == 1:
+t0 = time.ticks_ms()
+while time.ticks_diff(time.ticks_ms(), t0) < 1000:
+    if btn.value():
         held = False
         break
-    time.sleep(0.1)
+    time.sleep_ms(100)
 
 if held:
     logger.info("DEBUG: Exited program.")
@@ -90,9 +90,9 @@ async def read_battery_task(cache, batt, interval_s=15):
     
     while True:
         try:
-            # Read battery (ADC operation)
+            # Read battery (single ADC sample; percent derived from it)
             voltage = batt.read_voltage()
-            percent = batt.read_percentage()
+            percent = batt.percentage_from_voltage(voltage)
             # Update cache (thread-safe)
             cache.update_battery(voltage, percent)
             if voltage is not None:
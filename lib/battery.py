@@ -43,8 +43,15 @@ class Battery:
 
     def read_percentage(self):
         """Estimate battery percentage (simple linear model), or None on error."""
+        return self.percentage_from_voltage(self.read_voltage())
+
+    def percentage_from_voltage(self, v):
+        """Convert an already measured voltage to percentage, or None on error.
+
+        Use this instead of read_percentage() when the voltage has just been
+        read, to avoid sampling the ADC a second time.
+        """
         try:
-            v = self.read_voltage()
             if v is None:
                 return None
             if v <= self.v_empty:
@@ -68,7 +75,7 @@ class Battery:
     def read(self):
         """Return tuple: (voltage, percentage, state)"""
         v = self.read_voltage()
-        p = self.read_percentage()
+        p = self.percentage_from_voltage(v)
         state = None
         if self.charge_pin is not None:
             state = "charging" if self.is_charging() else "discharging"
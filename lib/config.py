@@ -2,7 +2,6 @@
 # Centralized configuration and settings helpers for weather station
 
 import json
-import os
 
 SETTINGS_FILE = "settings.json"
 
@@ -28,12 +27,11 @@ REFRESH_INTERVALS = {
 
 def load_settings():
     """Load settings from SETTINGS_FILE, with safe defaults."""
-    if SETTINGS_FILE in os.listdir():
-        try:
-            with open(SETTINGS_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        with open(SETTINGS_FILE, "r") as f:
+            return json.load(f)
+    except Exception:
+        pass  # Missing (OSError) or unreadable: use defaults
     return {
         "i2c": {"sda": 16, "scl": 17},
         "power": {
@@ -108,7 +106,8 @@ def get_display_settings(settings: dict):
       {
         "display": {
           "refresh_fps": <int>,    # Display refresh rate in frames per second
-          "input_poll_hz": <int>   # Input polling rate in Hz
+          "input_poll_hz": <int>   # Input polling rate in Hz (unused: input is
+                                   # now interrupt-driven)
         }
       }
     
@@ -249,7 +248,7 @@ def get_webserver_settings(settings: dict):
           "refresh_interval_s": <int>,     # Auto-refresh interval in seconds
           "max_connections": <int>,        # Maximum concurrent connections
           "response_timeout_s": <int>,     # HTTP response timeout in seconds
-          "chunk_size": <int>              # HTTP chunk size for responses
+          "backlog": <int>                 # Listen socket accept backlog
         }
       }
     
@@ -264,5 +263,5 @@ def get_webserver_settings(settings: dict):
         "refresh_interval_s": webserver_cfg.get("refresh_interval_s", 10),     # 10 seconds
         "max_connections": webserver_cfg.get("max_connections", 2),            # 2 connections
         "response_timeout_s": webserver_cfg.get("response_timeout_s", 30),    # 30 seconds
-        "chunk_size": webserver_cfg.get("chunk_size", 512)                   # 512 bytes
+        "backlog": webserver_cfg.get("backlog", 8)                           # 8 pending
     }
@@ -7,8 +7,7 @@ Provides two backends:
 - ezFBmarquee integration for scrolling text.
 """
 
-import framebuf
-from font_renderer import FontRenderer
+from font_renderer import FontRenderer, _text_scaled
 
 # Try to import ezFBmarquee
 _HAS_MARQUEE = False
@@ -30,24 +29,11 @@ from fonts import get_font_module
 def text_scaled(oled, text, x, y, scale=1):
     """Draw text at (x, y) scaled by integer 'scale' onto the provided oled.
 
-    Falls back to oled.text for scale == 1 to save work.
+    Falls back to oled.text for scale == 1 to save work; larger scales blit
+    cached pre-scaled glyphs.
     Note: Prefer using draw_text() with FontRenderer for better font support.
     """
-    if scale == 1:
-        oled.text(text, x, y)
-        return
-    w = len(text) * 8
-    h = 8
-    buf = bytearray(w * h // 8)
-    fb = framebuf.FrameBuffer(buf, w, h, framebuf.MONO_HLSB)
-    fb.fill(0)
-    fb.text(text, 0, 0, 1)
-    for yy in range(h):
-        for xx in range(w):
-            if fb.pixel(xx, yy):
-                for dy in range(int(scale)):
-                    for dx in range(int(scale)):
-                        oled.pixel(int(x + xx * scale + dx), int(y + yy * scale + dy), 1)
+    _text_scaled(oled, text, x, y, scale)
 
 
 def show_big(oled, lines, scales):
@@ -63,10 +49,21 @@ def show_big(oled, lines, scales):
         s = scales[i] if i < len(scales) else 1
         text_scaled(oled, l, 0, int(y), s)
         y += 9 * s + 2
-    oled.show()
+    oled.show_dirty()
 
 
 # -------- FontRenderer-backed helpers --------
+_renderer = None
+
+
+def _get_renderer(oled):
+    """Return a FontRenderer for oled, reusing it (and its ezFBfont instances) across draws."""
+    global _renderer
+    if _renderer is None or _renderer.device is not oled:
+        _renderer = FontRenderer(oled)
+    return _renderer
+
+
 def draw_text(oled, text, x, y, font="PTSans_08", scale=1, align="left", color=1):
     """Draw text using FontRenderer with ezFBfont support.
     
@@ -79,7 +76,7 @@ def draw_text(oled, text, x, y, font="PTSans_08", scale=1, align="left", color=1
         align: Horizontal alignment ('left', 'center', 'right')
         color: Foreground color (1 for on, 0 for off)
     """
-    fr = FontRenderer(oled)
+    fr = _get_renderer(oled)
     
     # Adjust x position for alignment if not left
     if align != "left":
@@ -109,7 +106,7 @@ def draw_block(oled, lines, x, y, font="PTSans_08", scale=1, line_spacing=2, ali
         align: Text alignment ('left', 'center', 'right')
         color: Foreground color
     """
-    fr = FontRenderer(oled)
+    fr = _get_renderer(oled)
     fr.text_block(lines, x, y, font=font, scale=scale, line_spacing=line_spacing, align=align, color=color)
 
 
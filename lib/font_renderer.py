@@ -143,21 +143,49 @@ class FontRenderer:
             yy += (8 * max(1, scale)) + line_spacing
 
 
+# Scaled 8x8 glyphs rendered once and blitted from then on: (char, scale) -> FrameBuffer
+_glyph_cache = {}
+_glyph_src = bytearray(8)
+_glyph_fb = framebuf.FrameBuffer(_glyph_src, 8, 8, framebuf.MONO_HLSB)
+_palettes = {}  # color -> 2-entry palette for blitting glyphs in a non-default color
+
+
+def _scaled_glyph(ch, scale):
+    """Return a cached MONO_HLSB FrameBuffer of `ch` drawn at `scale`."""
+    key = (ch, scale)
+    glyph = _glyph_cache.get(key)
+    if glyph is None:
+        _glyph_fb.fill(0)
+        _glyph_fb.text(ch, 0, 0, 1)
+        size = int(8 * scale)
+        step = max(1, int(scale))
+        glyph = framebuf.FrameBuffer(bytearray(((size + 7) // 8) * size), size, size,
+                                     framebuf.MONO_HLSB)
+        for yy in range(8):
+            for xx in range(8):
+                if _glyph_fb.pixel(xx, yy):
+                    glyph.fill_rect(int(xx * scale), int(yy * scale), step, step, 1)
+        _glyph_cache[key] = glyph
+    return glyph
+
+
 def _text_scaled(oled, text, x, y, scale=1, color=1):
-    """Fallback text rendering with software scaling."""
+    """Fallback text rendering with software scaling.
+
+    Each character is blitted from the glyph cache, so the per-pixel work
+    only happens the first time a (char, scale) pair is drawn.
+    """
     if scale == 1:
         # SSD1306 text() method only takes 3 args: text, x, y (no color parameter)
         oled.text(text, x, y)
         return
-    w = len(text) * 8
-    h = 8
-    buf = bytearray(w * h // 8)
-    fb = framebuf.FrameBuffer(buf, w, h, framebuf.MONO_HLSB)
-    fb.fill(0)
-    fb.text(text, 0, 0, 1)
-    for yy in range(h):
-        for xx in range(w):
-            if fb.pixel(xx, yy):
-                for dy in range(int(scale)):
-                    for dx in range(int(scale)):
-                        oled.pixel(int(x + xx * scale + dx), int(y + yy * scale + dy), color)
+    palette = None
+    if color != 1:
+        palette = _palettes.get(color)
+        if palette is None:
+            palette = framebuf.FrameBuffer(bytearray(1), 2, 1, framebuf.MONO_HLSB)
+            palette.pixel(1, 0, color)
+            _palettes[color] = palette
+    advance = 8 * scale
+    for i, ch in enumerate(text):
+        oled.blit(_scaled_glyph(ch, scale), int(x + i * advance), y, 0, palette)
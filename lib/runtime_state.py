@@ -43,7 +43,7 @@ def save_runtime_state(state):
     """
     try:
         with open(RUNTIME_FILE, "w") as f:
-            json.dump(state, f)
+            f.write(json.dumps(state))
         return True
     except Exception as e:
         logger.error(f"Failed to save runtime state: {e}")
@@ -25,12 +25,17 @@ class ScreenManager:
         self.cache = cache
         self.font_scales = font_scales
         self.screen_idx = 0
-        self.last_refresh = 0
         self.needs_redraw = False  # Flag to force immediate redraw
         
         # Initialize screen list (will update as sensors become available)
         self.screens = available_screens(cache)
         
+        # Current screen name and refresh schedule, kept in step with screen_idx
+        self.current_name = "resetwifi"
+        self.refresh_interval_ms = 0
+        self.refresh_deadline_ms = 0
+        self._select(0)
+        
         # Menu navigation state
         self.in_submenu = False
         self.submenu_type = None  # "settings" or "mode_select"
@@ -43,14 +48,22 @@ class ScreenManager:
         self.timeout_confirm_index = 0  # 0=Save, 1=Cancel
         self.original_timeout_value = None  # Store original value for cancel
     
+    def _select(self, idx):
+        """Make screen idx current and cache its name and refresh interval."""
+        self.screen_idx = idx
+        if self.screens:
+            self.current_name = self.screens[idx][0]
+        else:
+            self.current_name = "resetwifi"  # Fallback
+        self.refresh_interval_ms = REFRESH_INTERVALS.get(self.current_name, 0) * 1000
+
     def update_available_screens(self):
         """Update the list of available screens based on current sensor data."""
         old_count = len(self.screens)
         self.screens = available_screens(self.cache)
         
         # Clamp current index if screen count changed
-        if self.screen_idx >= len(self.screens):
-            self.screen_idx = len(self.screens) - 1
+        self._select(max(0, min(self.screen_idx, len(self.screens) - 1)))
         
         # Log if screens changed
         if len(self.screens) != old_count:
@@ -58,38 +71,42 @@ class ScreenManager:
     
     def get_current_screen_name(self):
         """Get the name/ID of the current screen."""
-        if self.screens:
-            return self.screens[self.screen_idx][0]
-        return "resetwifi"  # Fallback
+        return self.current_name
     
     def next_screen(self):
         """Switch to the next screen."""
         if self.screens:
-            self.screen_idx = (self.screen_idx + 1) % len(self.screens)
+            self._select((self.screen_idx + 1) % len(self.screens))
             self.needs_redraw = True  # Force immediate redraw
-            logger.debug(f"Screen: {self.get_current_screen_name()}")
+            logger.debug(f"Screen: {self.current_name}")
     
     def prev_screen(self):
         """Switch to the previous screen."""
         if self.screens:
-            self.screen_idx = (self.screen_idx - 1) % len(self.screens)
+            self._select((self.screen_idx - 1) % len(self.screens))
             self.needs_redraw = True  # Force immediate redraw
-            logger.debug(f"Screen: {self.get_current_screen_name()}")
+            logger.debug(f"Screen: {self.current_name}")
 
     def should_refresh(self):
         """Check if current screen should be refreshed based on interval."""
-        screen_name = self.get_current_screen_name()
-        interval = REFRESH_INTERVALS.get(screen_name, 0)
-
-        if interval <= 0:
+        if self.refresh_interval_ms <= 0:
             return False  # No automatic refresh
+        return time.ticks_diff(time.ticks_ms(), self.refresh_deadline_ms) >= 0
+
+    def ms_until_next_refresh(self):
+        """Return milliseconds until the current screen is due for a refresh.
 
-        now = time.time()
-        return (now - self.last_refresh) > interval
+        Returns:
+            int: Milliseconds to wait (0 if already due), or -1 if the
+                current screen has no automatic refresh
+        """
+        if self.refresh_interval_ms <= 0:
+            return -1
+        return max(0, time.ticks_diff(self.refresh_deadline_ms, time.ticks_ms()))
 
     def mark_refreshed(self):
         """Mark that the screen was just refreshed."""
-        self.last_refresh = time.time()
+        self.refresh_deadline_ms = time.ticks_add(time.ticks_ms(), self.refresh_interval_ms)
 
     def draw_screen(self, cache, oled):
         """Draw the current screen to the display using cached data.
@@ -98,8 +115,7 @@ class ScreenManager:
             cache: SensorCache instance (for convenience, though self.cache exists)
             oled: SSD1306 display instance
         """
-        screen_name = self.get_current_screen_name()
-        draw_screen(screen_name, oled, cache, self.font_scales)
+        draw_screen(self.current_name, oled, cache, self.font_scales)
 
     def enter_settings_menu(self):
         """Enter the settings submenu."""
@@ -254,7 +270,7 @@ class ScreenManager:
                 {"type": "reset_wifi"}
                 {"type": "set_mode", "mode": "station"}
         """
-        screen_name = self.get_current_screen_name()
+        screen_name = self.current_name
         
         # Check if we're in settings screen (entry point)
         if screen_name == "settings" and not self.in_submenu:
@@ -68,15 +68,58 @@ def available_screens(cache):
     ]
 
 
+# (screen name, inputs, oled frame count) of the last draw_screen() render
+_last_render = None
+
+
+def _render_inputs(name, cache):
+    """Return the data a screen is drawn from, for change detection.
+    
+    These are the same cache getters the screen draws from, so an
+    unchanged snapshot means the screen would render identically.
+    
+    Args:
+        name: Screen name/ID
+        cache: SensorCache instance
+    
+    Returns:
+        Comparable snapshot of the screen's inputs (None for static screens)
+    """
+    if name == "sht":
+        return cache.get_shtc3()
+    if name == "pm":
+        return cache.get_apc1_pm()
+    if name == "gases":
+        return cache.get_apc1_gases()
+    if name == "aqi":
+        return cache.get_apc1_aqi()
+    if name == "connect" or name == "sysinfo":
+        try:
+            import wifi_helper
+            wifi = wifi_helper.get_status_fast()
+        except Exception:
+            wifi = None
+        return wifi, cache.get_battery() if name == "sysinfo" else None
+    return None
+
+
 def draw_screen(name, oled, cache, font_scales):
     """Render a named screen to the OLED using cached sensor data.
     
+    Skips rendering when the screen's inputs are unchanged and nothing
+    else has been drawn to the display since it was last rendered.
+    
     Args:
         name: Screen name/ID
         oled: SSD1306 display instance
         cache: SensorCache instance
         font_scales: Dictionary of font scales (legacy, may be unused)
     """
+    global _last_render
+    render = (name, _render_inputs(name, cache), oled.frames)
+    if render == _last_render and oled.buffer == oled._shadow:
+        return
+
     oled.fill(0)
 
     if name == "sht":
@@ -151,9 +194,9 @@ def draw_screen(name, oled, cache, font_scales):
         # Connect to.. screen with QR code
         try:
             import wifi_helper
-            if wifi_helper.is_connected():
+            connected, ip = wifi_helper.get_status_fast()
+            if connected:
                 # WiFi is connected - show QR code
-                ip = wifi_helper.get_ip_address()
                 if ip:
                     url = f"http://{ip}"
                     draw_qr_code(oled, url, pixel_size=2)
@@ -192,8 +235,8 @@ def draw_screen(name, oled, cache, font_scales):
         draw_text(oled, "IP:", 0, 38, font="amstrad", align="left")
         try:
             import wifi_helper
-            if wifi_helper.is_connected():
-                ip = wifi_helper.get_ip_address()
+            connected, ip = wifi_helper.get_status_fast()
+            if connected:
                 # Truncate if too long (max ~16 chars for amstrad font)
                 if len(ip) > 15:
                     ip = ip[-15:]  # Show last 15 chars
@@ -209,7 +252,9 @@ def draw_screen(name, oled, cache, font_scales):
         oled.hline(0, 10, 128, 1)
         draw_text(oled, "Press to enter", 0, 20, font="amstrad")
     
-    oled.show()
+    # Screens refresh with mostly unchanged pixels; send only what changed
+    oled.show_dirty()
+    _last_render = (name, render[1], oled.frames)
 
 
 def draw_settings_menu(oled, selected_index=0, scroll_offset=0):
@@ -246,7 +291,8 @@ def draw_settings_menu(oled, selected_index=0, scroll_offset=0):
         prefix = "> " if option_index == selected_index else "  "
         draw_text(oled, prefix + options[option_index], 0, y, font="amstrad", align="left")
     
-    oled.show()
+    # Moving the selection only changes a line or two; send just those pages
+    oled.show_dirty()
 
 
 def draw_mode_selection(oled, selected_index=0, current_mode="mobile"):
@@ -274,7 +320,7 @@ def draw_mode_selection(oled, selected_index=0, current_mode="mobile"):
         suffix = " *" if mode_val and mode_val == current_mode else ""
         draw_text(oled, prefix + label + suffix, 0, y, font="amstrad", align="left")
     
-    oled.show()
+    oled.show_dirty()
 
 
 def draw_reset_confirmation(oled, selected_index=0):
@@ -297,7 +343,7 @@ def draw_reset_confirmation(oled, selected_index=0):
         prefix = "> " if i == selected_index else "  "
         draw_text(oled, prefix + option, 0, y, font="amstrad", align="left")
     
-    oled.show()
+    oled.show_dirty()
 
 
 def draw_display_settings(oled, timeout_value, mode="adjusting", confirm_index=0):
@@ -347,7 +393,7 @@ def draw_display_settings(oled, timeout_value, mode="adjusting", confirm_index=0
             prefix = "> " if i == confirm_index else "  "
             draw_text(oled, prefix + option, 0, y, font="amstrad", align="left")
     
-    oled.show()
+    oled.show_dirty()
 
 
 def draw_debug_menu(oled, selected_index=0):
@@ -369,4 +415,4 @@ def draw_debug_menu(oled, selected_index=0):
         prefix = "> " if i == selected_index else "  "
         draw_text(oled, prefix + option, 0, y, font="amstrad", align="left")
     
-    oled.show()
+    oled.show_dirty()
@@ -6,6 +6,20 @@ to be independent of sensor I2C operations.
 """
 
 import time
+from apc1 import APC1
+
+# /api/data body; the schema is fixed so it is filled in one formatting pass
+_API_JSON_FMT = (
+    '{"temperature": %s, "humidity": %s, "temp_timestamp": %s, '
+    '"pm1": %s, "pm25": %s, "pm10": %s, "pm_timestamp": %s, '
+    '"tvoc": %s, "eco2": %s, "aqi_pm25": %s, "aqi_tvoc": %s, '
+    '"battery_voltage": %s, "battery_percent": %s, "battery_timestamp": %s}'
+)
+
+
+def _j(value):
+    """Format a numeric reading as a JSON value (None -> null)."""
+    return 'null' if value is None else str(value)
 
 
 class SensorCache:
@@ -47,6 +61,10 @@ class SensorCache:
         
         # Lock flag for thread safety (simple busy-wait lock)
         self._lock = False
+        
+        # Optional callback run after each sensor update (e.g. to wake the
+        # display task); set by the owner
+        self.on_update = None
     
     def _acquire_lock(self):
         """Simple spin-lock acquisition."""
@@ -58,6 +76,11 @@ class SensorCache:
         """Release the lock."""
         self._lock = False
     
+    def _notify(self):
+        """Run the on_update callback, if any."""
+        if self.on_update is not None:
+            self.on_update()
+    
     # -------- SHTC3 Methods --------
     def update_shtc3(self, temperature, humidity):
         """Update SHTC3 temperature and humidity readings.
@@ -73,6 +96,7 @@ class SensorCache:
             self._data['temp_timestamp'] = time.time()
         finally:
             self._release_lock()
+            self._notify()
     
     def get_shtc3(self):
         """Get SHTC3 readings.
@@ -115,14 +139,15 @@ class SensorCache:
             self._data['rh_comp'] = readings.get('RH-comp', {}).get('value')
             self._data['pm_timestamp'] = time.time()
             
-            # Compute AQI from PM2.5 if available
+            # Compute AQI from PM2.5 if available (once per reading, so
+            # display and web readers only ever see the stored value)
             if self._data['pm25'] is not None:
-                from apc1 import APC1
                 self._data['aqi_pm25'] = APC1.compute_aqi_pm25(self._data['pm25'])
             else:
                 self._data['aqi_pm25'] = None
         finally:
             self._release_lock()
+            self._notify()
     
     def get_apc1_pm(self):
         """Get particulate matter readings.
@@ -212,6 +237,7 @@ class SensorCache:
             self._data['battery_timestamp'] = time.time()
         finally:
             self._release_lock()
+            self._notify()
     
     def get_battery(self):
         """Get battery readings.
@@ -250,6 +276,28 @@ class SensorCache:
         finally:
             self._release_lock()
     
+    def pack_api_json(self):
+        """Format all readings as the webserver's /api/data JSON body.
+
+        Reads everything under a single lock acquisition and formats it
+        straight from the cache, without intermediate tuples or dicts.
+
+        Returns:
+            bytes: Encoded JSON body
+        """
+        self._acquire_lock()
+        try:
+            d = self._data
+            return (_API_JSON_FMT % (
+                _j(d['temperature']), _j(d['humidity']), _j(d['temp_timestamp']),
+                _j(d['pm1']), _j(d['pm25']), _j(d['pm10']), _j(d['pm_timestamp']),
+                _j(d['tvoc']), _j(d['eco2']), _j(d['aqi_pm25']), _j(d['aqi_tvoc']),
+                _j(d['battery_voltage']), _j(d['battery_percent']),
+                _j(d['battery_timestamp']),
+            )).encode()
+        finally:
+            self._release_lock()
+    
     def has_shtc3_data(self):
         """Check if SHTC3 data is available."""
         return self._data['temperature'] is not None
@@ -34,6 +34,11 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        # Copy of what the panel currently shows, for show_dirty()
+        self._shadow = bytearray(self.pages * self.width)
+        # Count of transfers to the panel, so callers can tell whether
+        # anything else was shown since they last drew
+        self.frames = 0
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
@@ -94,6 +99,26 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_SEG_REMAP | (rotate & 1))
 
     def show(self):
+        self._write_pages(0, self.pages - 1)
+
+    def show_dirty(self):
+        # Send only the band of pages that differs from the last frame
+        # sent; returns False without touching the bus if nothing changed
+        buf = self.buffer
+        shadow = self._shadow
+        if buf == shadow:
+            return False
+        w = self.width
+        p0 = 0
+        while buf[p0 * w:(p0 + 1) * w] == shadow[p0 * w:(p0 + 1) * w]:
+            p0 += 1
+        p1 = self.pages - 1
+        while buf[p1 * w:(p1 + 1) * w] == shadow[p1 * w:(p1 + 1) * w]:
+            p1 -= 1
+        self._write_pages(p0, p1)
+        return True
+
+    def _write_pages(self, p0, p1):
         x0 = 0
         x1 = self.width - 1
         if self.width != 128:
@@ -105,9 +130,14 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(x0)
         self.write_cmd(x1)
         self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        self.write_cmd(p0)
+        self.write_cmd(p1)
+        start = p0 * self.width
+        end = (p1 + 1) * self.width
+        band = memoryview(self.buffer)[start:end]
+        self.write_data(band)
+        self._shadow[start:end] = band
+        self.frames += 1
 
 
 class SSD1306_I2C(SSD1306):
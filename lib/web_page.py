@@ -0,0 +1,335 @@
+"""web_page.py
+Dashboard page template for the Pico Weather Station webserver.
+
+Has no MicroPython-only imports so the page can also be rendered on a
+host by tools/build_web_page.py, which writes a gzip-compressed copy to
+www/index.html.gz for the webserver to stream straight from flash.
+"""
+
+
+def build_css():
+    """Generate CSS styles for responsive design.
+
+    Returns:
+        str: Stylesheet inlined into the page
+    """
+    return """* { margin: 0; padding: 0; box-sizing: border-box; }
+body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); min-height: 100vh; }
+.container { max-width: 1200px; margin: 0 auto; padding: 20px; }
+header { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 20px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }
+h1 { color: #2c3e50; margin-bottom: 10px; font-size: 2.5em; }
+.status-bar { display: flex; justify-content: space-between; align-items: center; font-size: 0.9em; color: #666; }
+.sensor-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin-bottom: 30px; }
+.sensor-card { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 20px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); transition: transform 0.2s ease; }
+.sensor-card:hover { transform: translateY(-2px); }
+.sensor-card h3 { color: #2c3e50; margin-bottom: 10px; font-size: 1.2em; }
+.value { font-size: 2em; font-weight: bold; color: #3498db; margin-bottom: 5px; }
+.timestamp { font-size: 0.8em; color: #666; }
+.timestamp .fresh { color: #27ae60; }
+.timestamp .stale { color: #f39c12; }
+.timestamp .old { color: #e74c3c; }
+.control-panel { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 20px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }
+.control-panel h2 { color: #2c3e50; margin-bottom: 20px; }
+.control-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; }
+.control-item { background: #f8f9fa; border-radius: 10px; padding: 15px; }
+.control-item h3 { color: #2c3e50; margin-bottom: 10px; }
+.status { font-size: 1.1em; font-weight: bold; margin-bottom: 10px; }
+.info { font-size: 0.9em; color: #666; white-space: pre-line; }
+button { background: #3498db; color: white; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; font-size: 1em; transition: background 0.2s ease; }
+button:hover:not(:disabled) { background: #2980b9; }
+button:disabled { background: #95a5a6; cursor: not-allowed; }
+footer { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 15px; margin-top: 20px; text-align: center; color: #666; font-size: 0.9em; }
+@media (max-width: 768px) { .container { padding: 10px; } h1 { font-size: 2em; } .sensor-grid { grid-template-columns: 1fr; } .control-grid { grid-template-columns: 1fr; } .value { font-size: 1.5em; } }"""
+
+
+def build_html(refresh_interval):
+    """Generate HTML page with responsive design.
+
+    Args:
+        refresh_interval: Auto-refresh interval in seconds
+
+    Returns:
+        str: Complete HTML page
+    """
+    css = build_css()
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Pico Weather Station</title>
+    <style>{css}</style>
+</head>
+<body>
+    <div class="container">
+        <header>
+            <h1>🌤️ Pico Weather Station</h1>
+            <div class="status-bar">
+                <span id="connection-status">🟢 Connected</span>
+                <span id="last-update">Loading...</span>
+            </div>
+        </header>
+        
+        <main>
+            <section class="sensor-grid">
+                <div class="sensor-card temperature">
+                    <h3>🌡️ Temperature</h3>
+                    <div class="value" id="temperature">--°C</div>
+                    <div class="timestamp" id="temp-time">--</div>
+                </div>
+                
+                <div class="sensor-card humidity">
+                    <h3>💧 Humidity</h3>
+                    <div class="value" id="humidity">--%</div>
+                    <div class="timestamp" id="humid-time">--</div>
+                </div>
+                
+                <div class="sensor-card pm25">
+                    <h3>🫧 PM2.5</h3>
+                    <div class="value" id="pm25">-- µg/m³</div>
+                    <div class="timestamp" id="pm25-time">--</div>
+                </div>
+                
+                <div class="sensor-card pm10">
+                    <h3>🫧 PM10</h3>
+                    <div class="value" id="pm10">-- µg/m³</div>
+                    <div class="timestamp" id="pm10-time">--</div>
+                </div>
+                
+                <div class="sensor-card tvoc">
+                    <h3>🌫️ TVOC</h3>
+                    <div class="value" id="tvoc">-- ppb</div>
+                    <div class="timestamp" id="tvoc-time">--</div>
+                </div>
+                
+                <div class="sensor-card eco2">
+                    <h3>💨 eCO2</h3>
+                    <div class="value" id="eco2">-- ppm</div>
+                    <div class="timestamp" id="eco2-time">--</div>
+                </div>
+                
+                <div class="sensor-card aqi">
+                    <h3>📊 AQI</h3>
+                    <div class="value" id="aqi">--</div>
+                    <div class="timestamp" id="aqi-time">--</div>
+                </div>
+                
+                <div class="sensor-card battery">
+                    <h3>🔋 Battery</h3>
+                    <div class="value" id="battery">--V (--%)</div>
+                    <div class="timestamp" id="battery-time">--</div>
+                </div>
+            </section>
+            
+            <section class="control-panel">
+                <h2>System Control</h2>
+                <div class="control-grid">
+                    <div class="control-item">
+                        <h3>APC1 Sensor</h3>
+                        <div class="status" id="apc1-status">Checking...</div>
+                        <button id="wake-apc1" onclick="wakeAPC1()">Wake APC1</button>
+                    </div>
+                    
+                    <div class="control-item">
+                        <h3>Display</h3>
+                        <div class="status" id="display-status">Checking...</div>
+                    </div>
+                    
+                    <div class="control-item">
+                        <h3>System Info</h3>
+                        <div class="info" id="system-info">Loading...</div>
+                    </div>
+                </div>
+            </section>
+        </main>
+        
+        <footer>
+            <p>Pico Weather Station | Auto-refresh every {refresh_interval}s</p>
+            <p id="debug-info"></p>
+        </footer>
+    </div>
+    
+    <script>
+        let lastDataTime = 0;
+        const TS_MAP = [
+            ['temp-time', 'temp_timestamp'], ['humid-time', 'temp_timestamp'],
+            ['pm25-time', 'pm_timestamp'], ['pm10-time', 'pm_timestamp'],
+            ['tvoc-time', 'pm_timestamp'], ['eco2-time', 'pm_timestamp'],
+            ['aqi-time', 'pm_timestamp'], ['battery-time', 'battery_timestamp']
+        ];
+        
+        function formatTimeAgo(timestamp) {{
+            if (!timestamp) return '--';
+            
+            const now = Math.floor(Date.now() / 1000);
+            const secondsAgo = now - timestamp;
+            
+            // Handle future timestamps (clock skew)
+            if (secondsAgo < 0) return 'just now';
+            
+            // Less than 1 minute
+            if (secondsAgo < 60) {{
+                return secondsAgo === 1 ? '1 second ago' : `${{secondsAgo}} seconds ago`;
+            }}
+            
+            // Less than 1 hour (show minutes)
+            if (secondsAgo < 3600) {{
+                const minutes = Math.floor(secondsAgo / 60);
+                return minutes === 1 ? '1 minute ago' : `${{minutes}} minutes ago`;
+            }}
+            
+            // Less than 1 day (show hours and minutes)
+            if (secondsAgo < 86400) {{
+                const hours = Math.floor(secondsAgo / 3600);
+                const minutes = Math.floor((secondsAgo % 3600) / 60);
+                if (minutes === 0) {{
+                    return hours === 1 ? '1 hour ago' : `${{hours}} hours ago`;
+                }}
+                return `${{hours}}hr${{minutes}}min ago`;
+            }}
+            
+            // 1 day or more (show days)
+            const days = Math.floor(secondsAgo / 86400);
+            const hours = Math.floor((secondsAgo % 86400) / 3600);
+            if (hours === 0) {{
+                return days === 1 ? '1 day ago' : `${{days}} days ago`;
+            }}
+            return `${{days}}d${{hours}}h ago`;
+        }}
+        
+        function formatAge(timestamp) {{
+            if (!timestamp) return 'class="old"';
+            const age = Math.floor(Date.now() / 1000) - timestamp;
+            if (age < 60) return 'class="fresh"';
+            if (age < 300) return 'class="stale"';
+            return 'class="old"';
+        }}
+        
+        function updateSensorDisplay(data) {{
+            try {{
+                document.getElementById('temperature').innerHTML = 
+                    data.temperature ? `${{data.temperature.toFixed(1)}}°C` : '--°C';
+                document.getElementById('humidity').innerHTML = 
+                    data.humidity ? `${{data.humidity.toFixed(1)}}%` : '--%';
+                
+                document.getElementById('pm25').innerHTML = 
+                    data.pm25 ? `${{data.pm25.toFixed(0)}} µg/m³` : '-- µg/m³';
+                document.getElementById('pm10').innerHTML = 
+                    data.pm10 ? `${{data.pm10.toFixed(0)}} µg/m³` : '-- µg/m³';
+                
+                document.getElementById('tvoc').innerHTML = 
+                    data.tvoc ? `${{data.tvoc.toFixed(0)}} ppb` : '-- ppb';
+                document.getElementById('eco2').innerHTML = 
+                    data.eco2 ? `${{data.eco2.toFixed(0)}} ppm` : '-- ppm';
+                
+                document.getElementById('aqi').innerHTML = 
+                    data.aqi_pm25 ? Math.floor(data.aqi_pm25) : '--';
+                
+                document.getElementById('battery').innerHTML = 
+                    data.battery_voltage ? `${{data.battery_voltage.toFixed(2)}}V (${{data.battery_percent.toFixed(0)}}%)` : '--V (--%)';
+                
+                TS_MAP.forEach(([el, key]) => {{
+                    const ts = data[key];
+                    document.getElementById(el).innerHTML = `<span ${{formatAge(ts)}}>${{formatTimeAgo(ts)}}</span>`;
+                }});
+                
+                document.getElementById('last-update').textContent = `Updated ${{formatTimeAgo(Math.floor(Date.now() / 1000))}}`;
+                lastDataTime = Date.now();
+                
+            }} catch (error) {{
+                console.error('Display update error:', error);
+            }}
+        }}
+        
+        function updateSystemStatus(status) {{
+            try {{
+                document.getElementById('apc1-status').textContent = status.apc1_awake ? 'Awake' : 'Sleeping';
+                document.getElementById('display-status').textContent = status.display_on ? 'On' : 'Off';
+                
+                const systemInfo = `WiFi: ${{status.wifi_connected ? 'Connected' : 'Disconnected'}}\\nIP: ${{status.ip_address || 'N/A'}}\\nFree RAM: ${{status.free_memory || 'N/A'}}KB\\nUptime: ${{status.uptime || 'N/A'}}s`;
+                document.getElementById('system-info').textContent = systemInfo;
+                
+            }} catch (error) {{
+                console.error('Status update error:', error);
+            }}
+        }}
+        
+        function wakeAPC1() {{
+            const button = document.getElementById('wake-apc1');
+            button.disabled = true;
+            button.textContent = 'Waking...';
+            
+            fetch('/api/wake')
+                .then(response => response.json())
+                .then(data => {{
+                    if (data.status === 'ok') {{
+                        button.textContent = 'Waking...';
+                        setTimeout(() => {{
+                            button.disabled = false;
+                            button.textContent = 'Wake APC1';
+                        }}, 5000);
+                    }} else {{
+                        button.textContent = 'Error';
+                        setTimeout(() => {{
+                            button.disabled = false;
+                            button.textContent = 'Wake APC1';
+                        }}, 2000);
+                    }}
+                }})
+                .catch(error => {{
+                    console.error('Wake error:', error);
+                    button.textContent = 'Error';
+                    setTimeout(() => {{
+                        button.disabled = false;
+                        button.textContent = 'Wake APC1';
+                    }}, 2000);
+                }});
+        }}
+        
+        function fetchData() {{
+            fetch('/api/data')
+                .then(response => response.json())
+                .then(data => updateSensorDisplay(data))
+                .catch(error => {{
+                    console.error('Data fetch error:', error);
+                    document.getElementById('connection-status').textContent = '🔴 Error';
+                }});
+        }}
+        
+        function fetchStatus() {{
+            fetch('/api/status')
+                .then(response => response.json())
+                .then(data => {{
+                    updateSystemStatus(data);
+                    document.getElementById('connection-status').textContent = '🟢 Connected';
+                }})
+                .catch(error => {{
+                    console.error('Status fetch error:', error);
+                    document.getElementById('connection-status').textContent = '🔴 Error';
+                }});
+        }}
+        
+        function sendHeartbeat() {{
+            fetch('/api/heartbeat')
+                .then(response => response.json())
+                .catch(error => console.error('Heartbeat error:', error));
+        }}
+        
+        function init() {{
+            fetchData();
+            fetchStatus();
+            
+            setInterval(fetchData, {refresh_interval * 1000});
+            setInterval(fetchStatus, {refresh_interval * 1000});
+            setInterval(sendHeartbeat, 30000);
+        }}
+        
+        if (document.readyState === 'loading') {{
+            document.addEventListener('DOMContentLoaded', init);
+        }} else {{
+            init();
+        }}
+    </script>
+</body>
+</html>"""
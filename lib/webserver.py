@@ -1,5 +1,5 @@
 """webserver.py
-Async HTTP webserver for Pico Weather Station with chunked responses.
+Async HTTP webserver for Pico Weather Station.
 
 Provides web interface for sensor data viewing and APC1 control.
 Integrates with existing power management and sensor cache.
@@ -10,21 +10,248 @@ try:
     import uasyncio as asyncio
 except ImportError:
     import asyncio
-import ujson
 import gc
+import os
+from array import array
 import time
 from micropython import const
+import socket
 import logger
+import wifi_helper
 
 # Constants for memory efficiency
 MAX_CONNECTIONS = const(2)
 RESPONSE_TIMEOUT = const(30)
-CHUNK_SIZE = const(512)
+GC_INTERVAL = const(30)  # Seconds between idle-time collections
+STATUS_CACHE_MS = const(1000)  # Reuse /api/status body for this long
+FILE_CHUNK_SIZE = const(512)  # Flash read size when streaming the main page
+REQUEST_BUFFER_SIZE = const(1024)
+REQUEST_LINE_MAX = const(128)  # Longest request line we route
+KEEPALIVE_MAX = const(20)  # Requests served per connection
+KEEPALIVE_IDLE_MS = const(5000)  # Idle time before a kept connection closes
+LISTEN_BACKLOG = const(8)
 SESSION_TIMEOUT = const(300)  # 5 minutes
+MAX_SESSIONS = const(8)  # Distinct clients tracked for web presence
+
+# Gzip-compressed main page built by tools/build_web_page.py
+HTML_GZ_PATH = "www/index.html.gz"
+
+# Pre-encoded /api/wake bodies (fixed shape, only the timestamp varies)
+_WAKE_OK_TMPL = b'{"status": "ok", "message": "APC1 wake initiated", "timestamp": %d}'
+_WAKE_ERROR_BODY = b'{"status": "error", "message": "APC1 power control not available"}'
+_HEARTBEAT_TMPL = b'{"status": "ok", "timestamp": %d, "active_sessions": %d}'
+# Numeric tail of the /api/status object
+_STATUS_TAIL_TMPL = (b', "free_memory": %d, "used_memory": %d,'
+                     b' "uptime": %d, "active_sessions": %d}')
+
+# Pre-encoded status lines for the status codes this server emits
+_STATUS_LINES = {
+    200: b"HTTP/1.1 200 OK\r\n",
+    201: b"HTTP/1.1 201 Created\r\n",
+    400: b"HTTP/1.1 400 Bad Request\r\n",
+    404: b"HTTP/1.1 404 Not Found\r\n",
+    500: b"HTTP/1.1 500 Internal Server Error\r\n",
+    503: b"HTTP/1.1 503 Service Unavailable\r\n",
+}
+
+# Fixed response header blocks (Connection and Content-Length are added
+# per response)
+_HDRS_HTML = (b"Content-Type: text/html; charset=utf-8\r\n"
+              b"Cache-Control: no-cache\r\n")
+_HDRS_JSON = (b"Content-Type: application/json\r\n"
+              b"Cache-Control: no-cache\r\n")
+# /api/status may be reused for STATUS_CACHE_MS, by us and by the browser
+_HDRS_JSON_1S = (b"Content-Type: application/json\r\n"
+                 b"Cache-Control: max-age=1\r\n")
+
+# Connection header lines, indexed by the keep-alive decision
+# Keep-Alive values mirror KEEPALIVE_IDLE_MS and KEEPALIVE_MAX
+_HDR_CONNECTION = (
+    b"Connection: close\r\n",
+    b"Connection: keep-alive\r\nKeep-Alive: timeout=5, max=20\r\n",
+)
+
+# Content-Length header lines keyed by body length (few distinct sizes)
+_CL_CACHE = {}
+_CL_CACHE_MAX = const(64)
+
+
+def _content_length_header(length):
+    """Return the Content-Length header line for a body length.
+
+    Args:
+        length: Body length in bytes
+
+    Returns:
+        bytes: Cached "Content-Length: N" header line (CRLF terminated)
+    """
+    hdr = _CL_CACHE.get(length)
+    if hdr is None:
+        if len(_CL_CACHE) >= _CL_CACHE_MAX:
+            _CL_CACHE.clear()
+        hdr = b"Content-Length: %d\r\n" % length
+        _CL_CACHE[length] = hdr
+    return hdr
+
+
+def _keep_alive(buf, n, version):
+    """Decide whether a connection may serve another request.
+
+    Header lines are walked in place in the pooled buffer; only the
+    Connection line, if any, is copied out.
+
+    Args:
+        buf: Pooled buffer holding the request head
+        n: Number of valid bytes in buf
+        version: HTTP version token from the request line
+
+    Returns:
+        bool: True if the client wants (and can get) a persistent connection
+    """
+    # HTTP/1.1 defaults to persistent, HTTP/1.0 must ask for it
+    keep = version == b"HTTP/1.1"
+    mv = memoryview(buf)
+    start = 0
+    for i in range(n):
+        if buf[i] != 10:  # LF
+            continue
+        if i - start <= 1:
+            # Blank line. Anything after it (a body, a pipelined request)
+            # is not parsed, so the stream position would be wrong for a
+            # following request.
+            return keep and i + 1 == n
+        # Skip the request line; 0x63 is "c" in either case
+        if start and (buf[start] | 0x20) == 0x63:
+            if bytes(mv[start:start + 11]).lower() == b"connection:":
+                value = bytes(mv[start + 11:i]).lower()
+                if b"close" in value:
+                    return False
+                if b"keep-alive" in value:
+                    keep = True
+        start = i + 1
+    # Incomplete head
+    return False
+
+
+# (level, option) for TCP_NODELAY, or None where the port lacks it
+try:
+    _NODELAY = (socket.IPPROTO_TCP, socket.TCP_NODELAY)
+except AttributeError:
+    _NODELAY = None
+
+
+def _set_nodelay(writer):
+    """Disable Nagle on a client connection so small replies go out at once."""
+    if _NODELAY is None:
+        return
+    # MicroPython streams expose the raw socket as .s
+    sock = getattr(writer, 's', None) or writer.get_extra_info('socket')
+    try:
+        sock.setsockopt(_NODELAY[0], _NODELAY[1], 1)
+    except Exception:
+        pass
+
+
+async def _write(writer, data):
+    """Write data, awaiting drain() only if it could not be sent at once.
+
+    MicroPython's Stream.write() already tries a direct non-blocking
+    socket write and keeps any remainder in out_buf; when nothing is
+    left there, drain() would only add a scheduler round-trip. Skipping
+    it also skips the yield, so this is only for one-off writes; loops
+    must drain every iteration to let other tasks run.
+    """
+    writer.write(data)
+    if getattr(writer, 'out_buf', True):
+        await writer.drain()
+
+
+def _file_size(path):
+    """Return the size of a file in bytes, or 0 if it doesn't exist."""
+    try:
+        return os.stat(path)[6]
+    except OSError:
+        return 0
+
+
+def _build_error_response(status_code, message):
+    """Build a complete, self-contained HTTP error response.
+
+    Args:
+        status_code: HTTP status code
+        message: Reason phrase shown in the status line and page
+
+    Returns:
+        bytes: Status line, headers and HTML body
+    """
+    body = (
+        "<!DOCTYPE html>\n<html>\n"
+        f"<head><title>Error {status_code}</title></head>\n<body>\n"
+        f"    <h1>Error {status_code}</h1>\n    <p>{message}</p>\n"
+        "    <hr>\n    <p>Pico Weather Station</p>\n</body>\n</html>"
+    ).encode()
+    head = (
+        f"HTTP/1.1 {status_code} {message}\r\n"
+        "Content-Type: text/html\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode()
+    return head + body
+
+
+# Error responses are fixed, so they are built once at import
+_ERROR_RESPONSES = {
+    400: _build_error_response(400, "Bad Request"),
+    404: _build_error_response(404, "Not Found"),
+    500: _build_error_response(500, "Internal Server Error"),
+    503: _build_error_response(503, "Service Unavailable"),
+}
+
+# Request-path error logging is rate limited so a misbehaving client
+# can't stall the loop formatting and writing sys.log entries
+_ERR_WINDOW_MS = const(60000)
+_ERR_BURST = const(5)
+_err_window_start = 0
+_err_count = 0
+_err_suppressed = 0
+
+
+def _log_error(context, e, detail=None):
+    """Log a request-path error, at most _ERR_BURST per window.
+
+    Formatting is deferred until the message is known to be emitted.
+
+    Args:
+        context: Short description of where the error happened
+        e: Exception instance
+        detail: Optional extra context (e.g. client IP)
+    """
+    global _err_window_start, _err_count, _err_suppressed
+    now = time.ticks_ms()
+    if time.ticks_diff(now, _err_window_start) >= _ERR_WINDOW_MS:
+        if _err_suppressed:
+            logger.warn(f"{_err_suppressed} webserver errors suppressed")
+        _err_window_start = now
+        _err_count = 0
+        _err_suppressed = 0
+    if _err_count >= _ERR_BURST:
+        _err_suppressed += 1
+        return
+    _err_count += 1
+    if detail is None:
+        logger.error(f"{context}: {e}")
+    else:
+        logger.error(f"{context} from {detail}: {e}")
 
 
 class WebSessionManager:
-    """Manages web sessions for power-aware APC1 control."""
+    """Manages web sessions for power-aware APC1 control.
+
+    Sessions live in two fixed-size arrays (client IP hash, last access
+    time) so tracking clients never allocates. A timestamp of 0 marks a
+    free slot; when all slots are taken the least recently seen client
+    is evicted.
+    """
     
     def __init__(self, timeout_s=SESSION_TIMEOUT):
         """Initialize session manager.
@@ -32,63 +259,71 @@ class WebSessionManager:
         Args:
             timeout_s: Session timeout in seconds
         """
-        self.active_sessions = {}
+        self._ip_hashes = array('I', [0] * MAX_SESSIONS)
+        self._ts = array('I', [0] * MAX_SESSIONS)
         self.timeout = timeout_s
-        self.last_cleanup = time.time()
+        self.wake_callback = None  # Set by WebServer when provided
     
-    def register_access(self, client_ip):
-        """Register web access and update system activity.
-        
+    @staticmethod
+    def client_key(client_ip):
+        """Return the session key for a client IP.
+
+        Computed once per connection so the per-request path compares
+        ints instead of hashing the IP string again.
+
         Args:
             client_ip: Client IP address as string
+
+        Returns:
+            int: IP hash, masked to stay a small int on MicroPython
+        """
+        return hash(client_ip) & 0x3FFFFFFF
+
+    def register_key(self, h):
+        """Register web access for a precomputed client key.
+
+        Args:
+            h: Session key from client_key()
         """
         try:
-            self.active_sessions[client_ip] = time.time()
+            hashes = self._ip_hashes
+            ts = self._ts
+
+            # Reuse this client's slot, else the free/least recent one
+            slot = 0
+            oldest = ts[0]
+            for i in range(MAX_SESSIONS):
+                t = ts[i]
+                if t and hashes[i] == h:
+                    slot = i
+                    break
+                if t < oldest:
+                    oldest = t
+                    slot = i
+
+            hashes[slot] = h
+            ts[slot] = int(time.time())
             
             # Trigger system wake-up for web activity
-            if hasattr(self, 'wake_callback') and self.wake_callback:
-                self.wake_callback("web")
+            wake = self.wake_callback
+            if wake is not None:
+                wake("web")
                 
         except Exception as e:
             logger.error(f"Session registration error: {e}")
     
-    def cleanup_expired(self):
-        """Remove expired sessions to prevent memory leaks."""
-        try:
-            now = time.time()
-            
-            # Only cleanup periodically to save CPU
-            if now - self.last_cleanup < 60:  # Cleanup every minute
-                return
-            
-            expired = []
-            for ip, last_access in self.active_sessions.items():
-                if now - last_access > self.timeout:
-                    expired.append(ip)
-            
-            for ip in expired:
-                del self.active_sessions[ip]
-            
-            self.last_cleanup = now
-            
-            if expired:
-                logger.info(f"Cleaned up {len(expired)} expired web sessions")
-
-        except Exception as e:
-            logger.error(f"Session cleanup error: {e}")
-
     def has_active_sessions(self):
         """Check if any web sessions are currently active.
 
         Returns:
             bool: True if active sessions exist
         """
-        try:
-            self.cleanup_expired()
-            return len(self.active_sessions) > 0
-        except Exception as e:
-            logger.error(f"Session check error: {e}")
-            return False
+        now = time.time()
+        timeout = self.timeout
+        for t in self._ts:
+            if t and now - t <= timeout:
+                return True
+        return False
 
     def get_session_count(self):
         """Get count of active sessions.
@@ -96,16 +331,29 @@ class WebSessionManager:
         Returns:
             int: Number of active sessions
         """
-        try:
-            self.cleanup_expired()
-            return len(self.active_sessions)
-        except Exception as e:
-            logger.error(f"Session count error: {e}")
-            return 0
+        now = time.time()
+        timeout = self.timeout
+        count = 0
+        for t in self._ts:
+            if t and now - t <= timeout:
+                count += 1
+        return count
 
 
 class WebServer:
     """Async HTTP webserver for weather station data."""
+
+    # Fixed attribute set (no per-instance __dict__ where supported)
+    __slots__ = (
+        'cache', 'apc1_power', 'wake_callback', 'config',
+        'port', 'session_timeout', 'refresh_interval', 'max_connections',
+        'response_timeout', 'backlog',
+        'sessions', 'server', 'running', 'active_connections',
+        '_stop_event', '_conn_deadlines', '_idle_tasks', '_sweeper',
+        '_gc_worker', '_buf_pool',
+        '_html_heads', '_html_body', '_file_buf', '_routes',
+        '_wifi_ip', '_status_body', '_status_ts', 'get_power_states',
+    )
     
     def __init__(self, sensor_cache, apc1_power=None, wake_callback=None, config=None):
         """Initialize webserver.
@@ -126,7 +374,8 @@ class WebServer:
         self.session_timeout = self.config.get('session_timeout_s', SESSION_TIMEOUT)
         self.refresh_interval = self.config.get('refresh_interval_s', 20)
         self.max_connections = self.config.get('max_connections', MAX_CONNECTIONS)
-        self.chunk_size = self.config.get('chunk_size', CHUNK_SIZE)
+        self.response_timeout = self.config.get('response_timeout_s', RESPONSE_TIMEOUT)
+        self.backlog = self.config.get('backlog', LISTEN_BACKLOG)
         
         # Session management
         self.sessions = WebSessionManager(self.session_timeout)
@@ -137,673 +386,451 @@ class WebServer:
         self.server = None
         self.running = False
         self.active_connections = 0
-        
-        # Cache HTML template to avoid rebuilding
-        self._html_template = None
-        self._css_styles = None
-        
+        self._stop_event = asyncio.Event()
+
+        # Per-connection deadlines (task -> ticks_ms), enforced by one sweeper
+        self._conn_deadlines = {}
+        # Keep-alive connections currently waiting for their next request
+        self._idle_tasks = set()
+        self._sweeper = None
+        self._gc_worker = None
+
+        # Request buffers reused across connections (one per slot)
+        self._buf_pool = [bytearray(REQUEST_BUFFER_SIZE)
+                          for _ in range(self.max_connections)]
+
+        # Path -> handler(writer, client_ip, keep) -> bool; the method is
+        # not checked
+        self._routes = {
+            b'/': self._handle_main_page,
+            b'/index.html': self._handle_main_page,
+            b'/api/data': self._handle_api_data,
+            b'/api/status': self._handle_api_status,
+            b'/api/heartbeat': self._handle_api_heartbeat,
+            b'/api/wake': self._handle_api_wake,
+        }
+
+        # Last encoded /api/status body and when it was built (ticks_ms)
+        self._status_body = None
+        self._status_ts = 0
+
+        # Bound once; returns None when not connected
+        self._wifi_ip = wifi_helper.get_ip_address
+
         # Power states getter (to be injected)
         self.get_power_states = None
+
+        # Main page: stream the prebuilt gzip page from flash if deployed,
+        # otherwise render it once and keep the body in RAM. The response
+        # head is prebuilt for both Connection variants.
+        gz_size = _file_size(HTML_GZ_PATH)
+        if gz_size:
+            self._html_body = None
+            self._html_heads = self._build_main_page_heads(
+                b"Content-Encoding: gzip\r\n", gz_size)
+            self._file_buf = bytearray(FILE_CHUNK_SIZE)
+        else:
+            logger.warn(f"{HTML_GZ_PATH} not found, rendering page in RAM")
+            self._file_buf = None
+            self._html_body = self._build_main_page_body()
+            self._html_heads = self._build_main_page_heads(b"", len(self._html_body))
+            gc.collect()
         
         logger.info(f"WebServer initialized (port: {self.port}, max_connections: {self.max_connections})")
     
-    def _get_html_template(self):
-        """Generate HTML template with responsive design.
-        
+    def _build_main_page_body(self):
+        """Render the main page HTML.
+
         Returns:
-            str: Complete HTML page template
+            bytes: Encoded HTML body
         """
-        if self._html_template is None:
-            try:
-                css = self._get_css_styles()
-                refresh_interval = self.refresh_interval
-                
-                self._html_template = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Pico Weather Station</title>
-    <style>{css}</style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>🌤️ Pico Weather Station</h1>
-            <div class="status-bar">
-                <span id="connection-status">🟢 Connected</span>
-                <span id="last-update">Loading...</span>
-            </div>
-        </header>
-        
-        <main>
-            <section class="sensor-grid">
-                <div class="sensor-card temperature">
-                    <h3>🌡️ Temperature</h3>
-                    <div class="value" id="temperature">--°C</div>
-                    <div class="timestamp" id="temp-time">--</div>
-                </div>
-                
-                <div class="sensor-card humidity">
-                    <h3>💧 Humidity</h3>
-                    <div class="value" id="humidity">--%</div>
-                    <div class="timestamp" id="humid-time">--</div>
-                </div>
-                
-                <div class="sensor-card pm25">
-                    <h3>🫧 PM2.5</h3>
-                    <div class="value" id="pm25">-- µg/m³</div>
-                    <div class="timestamp" id="pm25-time">--</div>
-                </div>
-                
-                <div class="sensor-card pm10">
-                    <h3>🫧 PM10</h3>
-                    <div class="value" id="pm10">-- µg/m³</div>
-                    <div class="timestamp" id="pm10-time">--</div>
-                </div>
-                
-                <div class="sensor-card tvoc">
-                    <h3>🌫️ TVOC</h3>
-                    <div class="value" id="tvoc">-- ppb</div>
-                    <div class="timestamp" id="tvoc-time">--</div>
-                </div>
-                
-                <div class="sensor-card eco2">
-                    <h3>💨 eCO2</h3>
-                    <div class="value" id="eco2">-- ppm</div>
-                    <div class="timestamp" id="eco2-time">--</div>
-                </div>
-                
-                <div class="sensor-card aqi">
-                    <h3>📊 AQI</h3>
-                    <div class="value" id="aqi">--</div>
-                    <div class="timestamp" id="aqi-time">--</div>
-                </div>
-                
-                <div class="sensor-card battery">
-                    <h3>🔋 Battery</h3>
-                    <div class="value" id="battery">--V (--%)</div>
-                    <div class="timestamp" id="battery-time">--</div>
-                </div>
-            </section>
-            
-            <section class="control-panel">
-                <h2>System Control</h2>
-                <div class="control-grid">
-                    <div class="control-item">
-                        <h3>APC1 Sensor</h3>
-                        <div class="status" id="apc1-status">Checking...</div>
-                        <button id="wake-apc1" onclick="wakeAPC1()">Wake APC1</button>
-                    </div>
-                    
-                    <div class="control-item">
-                        <h3>Display</h3>
-                        <div class="status" id="display-status">Checking...</div>
-                    </div>
-                    
-                    <div class="control-item">
-                        <h3>System Info</h3>
-                        <div class="info" id="system-info">Loading...</div>
-                    </div>
-                </div>
-            </section>
-        </main>
-        
-        <footer>
-            <p>Pico Weather Station | Auto-refresh every {refresh_interval}s</p>
-            <p id="debug-info"></p>
-        </footer>
-    </div>
-    
-    <script>
-        let lastDataTime = 0;
-        
-        function formatTimeAgo(timestamp) {{
-            if (!timestamp) return '--';
-            
-            const now = Math.floor(Date.now() / 1000);
-            const secondsAgo = now - timestamp;
-            
-            // Handle future timestamps (clock skew)
-            if (secondsAgo < 0) return 'just now';
-            
-            // Less than 1 minute
-            if (secondsAgo < 60) {{
-                return secondsAgo === 1 ? '1 second ago' : `${{secondsAgo}} seconds ago`;
-            }}
-            
-            // Less than 1 hour (show minutes)
-            if (secondsAgo < 3600) {{
-                const minutes = Math.floor(secondsAgo / 60);
-                return minutes === 1 ? '1 minute ago' : `${{minutes}} minutes ago`;
-            }}
-            
-            // Less than 1 day (show hours and minutes)
-            if (secondsAgo < 86400) {{
-                const hours = Math.floor(secondsAgo / 3600);
-                const minutes = Math.floor((secondsAgo % 3600) / 60);
-                if (minutes === 0) {{
-                    return hours === 1 ? '1 hour ago' : `${{hours}} hours ago`;
-                }}
-                return `${{hours}}hr${{minutes}}min ago`;
-            }}
-            
-            // 1 day or more (show days)
-            const days = Math.floor(secondsAgo / 86400);
-            const hours = Math.floor((secondsAgo % 86400) / 3600);
-            if (hours === 0) {{
-                return days === 1 ? '1 day ago' : `${{days}} days ago`;
-            }}
-            return `${{days}}d${{hours}}h ago`;
-        }}
-        
-        function formatAge(timestamp) {{
-            if (!timestamp) return 'class="old"';
-            const age = Math.floor(Date.now() / 1000) - timestamp;
-            if (age < 60) return 'class="fresh"';
-            if (age < 300) return 'class="stale"';
-            return 'class="old"';
-        }}
-        
-        function updateSensorDisplay(data) {{
-            try {{
-                document.getElementById('temperature').innerHTML = 
-                    data.temperature ? `${{data.temperature.toFixed(1)}}°C` : '--°C';
-                document.getElementById('humidity').innerHTML = 
-                    data.humidity ? `${{data.humidity.toFixed(1)}}%` : '--%';
-                
-                document.getElementById('pm25').innerHTML = 
-                    data.pm25 ? `${{data.pm25.toFixed(0)}} µg/m³` : '-- µg/m³';
-                document.getElementById('pm10').innerHTML = 
-                    data.pm10 ? `${{data.pm10.toFixed(0)}} µg/m³` : '-- µg/m³';
-                
-                document.getElementById('tvoc').innerHTML = 
-                    data.tvoc ? `${{data.tvoc.toFixed(0)}} ppb` : '-- ppb';
-                document.getElementById('eco2').innerHTML = 
-                    data.eco2 ? `${{data.eco2.toFixed(0)}} ppm` : '-- ppm';
-                
-                document.getElementById('aqi').innerHTML = 
-                    data.aqi_pm25 ? Math.floor(data.aqi_pm25) : '--';
-                
-                document.getElementById('battery').innerHTML = 
-                    data.battery_voltage ? `${{data.battery_voltage.toFixed(2)}}V (${{data.battery_percent.toFixed(0)}}%)` : '--V (--%)';
-                
-                const tempAge = formatAge(data.temp_timestamp);
-                document.getElementById('temp-time').innerHTML = `<span ${{tempAge}}>${{formatTimeAgo(data.temp_timestamp)}}</span>`;
-                document.getElementById('humid-time').innerHTML = `<span ${{tempAge}}>${{formatTimeAgo(data.temp_timestamp)}}</span>`;
-                
-                const pmAge = formatAge(data.pm_timestamp);
-                document.getElementById('pm25-time').innerHTML = `<span ${{pmAge}}>${{formatTimeAgo(data.pm_timestamp)}}</span>`;
-                document.getElementById('pm10-time').innerHTML = `<span ${{pmAge}}>${{formatTimeAgo(data.pm_timestamp)}}</span>`;
-                document.getElementById('tvoc-time').innerHTML = `<span ${{pmAge}}>${{formatTimeAgo(data.pm_timestamp)}}</span>`;
-                document.getElementById('eco2-time').innerHTML = `<span ${{pmAge}}>${{formatTimeAgo(data.pm_timestamp)}}</span>`;
-                document.getElementById('aqi-time').innerHTML = `<span ${{pmAge}}>${{formatTimeAgo(data.pm_timestamp)}}</span>`;
-                
-                const battAge = formatAge(data.battery_timestamp);
-                document.getElementById('battery-time').innerHTML = `<span ${{battAge}}>${{formatTimeAgo(data.battery_timestamp)}}</span>`;
-                
-                document.getElementById('last-update').textContent = `Updated ${{formatTimeAgo(Math.floor(Date.now() / 1000))}}`;
-                lastDataTime = Date.now();
-                
-            }} catch (error) {{
-                console.error('Display update error:', error);
-            }}
-        }}
-        
-        function updateSystemStatus(status) {{
-            try {{
-                document.getElementById('apc1-status').textContent = status.apc1_awake ? 'Awake' : 'Sleeping';
-                document.getElementById('display-status').textContent = status.display_on ? 'On' : 'Off';
-                
-                const systemInfo = `WiFi: ${{status.wifi_connected ? 'Connected' : 'Disconnected'}}\\nIP: ${{status.ip_address || 'N/A'}}\\nFree RAM: ${{status.free_memory || 'N/A'}}KB\\nUptime: ${{status.uptime || 'N/A'}}s`;
-                document.getElementById('system-info').textContent = systemInfo;
-                
-            }} catch (error) {{
-                console.error('Status update error:', error);
-            }}
-        }}
-        
-        function wakeAPC1() {{
-            const button = document.getElementById('wake-apc1');
-            button.disabled = true;
-            button.textContent = 'Waking...';
-            
-            fetch('/api/wake')
-                .then(response => response.json())
-                .then(data => {{
-                    if (data.status === 'ok') {{
-                        button.textContent = 'Waking...';
-                        setTimeout(() => {{
-                            button.disabled = false;
-                            button.textContent = 'Wake APC1';
-                        }}, 5000);
-                    }} else {{
-                        button.textContent = 'Error';
-                        setTimeout(() => {{
-                            button.disabled = false;
-                            button.textContent = 'Wake APC1';
-                        }}, 2000);
-                    }}
-                }})
-                .catch(error => {{
-                    console.error('Wake error:', error);
-                    button.textContent = 'Error';
-                    setTimeout(() => {{
-                        button.disabled = false;
-                        button.textContent = 'Wake APC1';
-                    }}, 2000);
-                }});
-        }}
-        
-        function fetchData() {{
-            fetch('/api/data')
-                .then(response => response.json())
-                .then(data => updateSensorDisplay(data))
-                .catch(error => {{
-                    console.error('Data fetch error:', error);
-                    document.getElementById('connection-status').textContent = '🔴 Error';
-                }});
-        }}
-        
-        function fetchStatus() {{
-            fetch('/api/status')
-                .then(response => response.json())
-                .then(data => {{
-                    updateSystemStatus(data);
-                    document.getElementById('connection-status').textContent = '🟢 Connected';
-                }})
-                .catch(error => {{
-                    console.error('Status fetch error:', error);
-                    document.getElementById('connection-status').textContent = '🔴 Error';
-                }});
-        }}
-        
-        function sendHeartbeat() {{
-            fetch('/api/heartbeat')
-                .then(response => response.json())
-                .catch(error => console.error('Heartbeat error:', error));
-        }}
-        
-        function init() {{
-            fetchData();
-            fetchStatus();
-            
-            setInterval(fetchData, {refresh_interval * 1000});
-            setInterval(fetchStatus, {refresh_interval * 1000});
-            setInterval(sendHeartbeat, 30000);
-        }}
-        
-        if (document.readyState === 'loading') {{
-            document.addEventListener('DOMContentLoaded', init);
-        }} else {{
-            init();
-        }}
-    </script>
-</body>
-</html>"""
-                
-            except Exception as e:
-                logger.error(f"HTML template generation error: {e}")
-                self._html_template = "<html><body><h1>Template Error</h1></body></html>"
-        
-        return self._html_template
-    
-    def _get_css_styles(self):
-        """Generate CSS styles for responsive design."""
-        if self._css_styles is None:
-            self._css_styles = """* { margin: 0; padding: 0; box-sizing: border-box; }
-body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); min-height: 100vh; }
-.container { max-width: 1200px; margin: 0 auto; padding: 20px; }
-header { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 20px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }
-h1 { color: #2c3e50; margin-bottom: 10px; font-size: 2.5em; }
-.status-bar { display: flex; justify-content: space-between; align-items: center; font-size: 0.9em; color: #666; }
-.sensor-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin-bottom: 30px; }
-.sensor-card { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 20px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); transition: transform 0.2s ease; }
-.sensor-card:hover { transform: translateY(-2px); }
-.sensor-card h3 { color: #2c3e50; margin-bottom: 10px; font-size: 1.2em; }
-.value { font-size: 2em; font-weight: bold; color: #3498db; margin-bottom: 5px; }
-.timestamp { font-size: 0.8em; color: #666; }
-.timestamp .fresh { color: #27ae60; }
-.timestamp .stale { color: #f39c12; }
-.timestamp .old { color: #e74c3c; }
-.control-panel { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 20px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }
-.control-panel h2 { color: #2c3e50; margin-bottom: 20px; }
-.control-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; }
-.control-item { background: #f8f9fa; border-radius: 10px; padding: 15px; }
-.control-item h3 { color: #2c3e50; margin-bottom: 10px; }
-.status { font-size: 1.1em; font-weight: bold; margin-bottom: 10px; }
-.info { font-size: 0.9em; color: #666; white-space: pre-line; }
-button { background: #3498db; color: white; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; font-size: 1em; transition: background 0.2s ease; }
-button:hover:not(:disabled) { background: #2980b9; }
-button:disabled { background: #95a5a6; cursor: not-allowed; }
-footer { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 15px; margin-top: 20px; text-align: center; color: #666; font-size: 0.9em; }
-@media (max-width: 768px) { .container { padding: 10px; } h1 { font-size: 2em; } .sensor-grid { grid-template-columns: 1fr; } .control-grid { grid-template-columns: 1fr; } .value { font-size: 1.5em; } }"""
-        
-        return self._css_styles
-    
-    def _get_sensor_data(self):
-        """Get all sensor data from cache."""
         try:
-            data = {}
-            
-            # SHTC3 data
-            temp, humid, temp_ts = self.cache.get_shtc3()
-            data['temperature'] = temp
-            data['humidity'] = humid
-            data['temp_timestamp'] = temp_ts
-            
-            # APC1 data
-            pm1, pm25, pm10, pm_ts = self.cache.get_apc1_pm()
-            data['pm1'] = pm1
-            data['pm25'] = pm25
-            data['pm10'] = pm10
-            data['pm_timestamp'] = pm_ts
-            
-            # Gas data
-            tvoc, eco2, _ = self.cache.get_apc1_gases()
-            data['tvoc'] = tvoc
-            data['eco2'] = eco2
-            
-            # AQI data
-            aqi_pm25, aqi_tvoc, _, _ = self.cache.get_apc1_aqi()
-            data['aqi_pm25'] = aqi_pm25
-            data['aqi_tvoc'] = aqi_tvoc
-            
-            # Battery data
-            voltage, percent, batt_ts = self.cache.get_battery()
-            data['battery_voltage'] = voltage
-            data['battery_percent'] = percent
-            data['battery_timestamp'] = batt_ts
-            
-            return data
-            
+            from web_page import build_html
+            return build_html(self.refresh_interval).encode('utf-8')
         except Exception as e:
-            logger.error(f"Sensor data error: {e}")
-            return {}
+            logger.error(f"HTML template generation error: {e}")
+            return b"<html><body><h1>Template Error</h1></body></html>"
+
+    @staticmethod
+    def _build_main_page_heads(extra, length):
+        """Build the main page response heads.
+
+        Args:
+            extra: Additional header lines (e.g. Content-Encoding)
+            length: Body length in bytes
+
+        Returns:
+            tuple: (close head, keep-alive head), indexed by keep-alive
+        """
+        return tuple(b"".join((
+            _STATUS_LINES[200],
+            _HDRS_HTML,
+            extra,
+            conn,
+            _content_length_header(length),
+            b"\r\n",
+        )) for conn in _HDR_CONNECTION)
 
     def _get_system_status(self):
-        """Get system status information."""
+        """Get system status information as a JSON body.
+
+        The shape is fixed, so the JSON is written directly instead of
+        building a dict for ujson to walk on every refresh.
+
+        Returns:
+            bytes: Encoded status object ({} if it can't be gathered)
+        """
         try:
-            status = {}
+            buf = bytearray(b"{")
 
-            # Power states (injected during initialization)
+            # Power states (injected during initialization), name -> bool
             if self.get_power_states:
-                status.update(self.get_power_states())
+                for name, on in self.get_power_states().items():
+                    buf.extend(b'"')
+                    buf.extend(name.encode())
+                    buf.extend(b'": true, ' if on else b'": false, ')
 
             # WiFi status
             try:
-                import wifi_helper
-                status['wifi_connected'] = wifi_helper.is_connected()
-                if status['wifi_connected']:
-                    import network
-                    sta = network.WLAN(network.STA_IF)
-                    status['ip_address'] = sta.ifconfig()[0] if sta.active() else None
-                else:
-                    status['ip_address'] = None
-            except Exception:
-                status['wifi_connected'] = False
-                status['ip_address'] = None
-
-            # Memory info
-            try:
-                gc.collect()
-                status['free_memory'] = gc.mem_free() // 1024
-                status['used_memory'] = gc.mem_alloc() // 1024
-            except Exception:
-                status['free_memory'] = None
-                status['used_memory'] = None
-
-            # Uptime
-            try:
-                status['uptime'] = int(time.time())
+                ip = self._wifi_ip()
             except Exception:
-                status['uptime'] = None
-
-            # Web sessions
-            status['active_sessions'] = self.sessions.get_session_count()
+                ip = None
+            if ip is None:
+                buf.extend(b'"wifi_connected": false, "ip_address": null')
+            else:
+                buf.extend(b'"wifi_connected": true, "ip_address": "')
+                buf.extend(ip.encode())
+                buf.extend(b'"')
 
-            return status
+            # Memory (collection happens in _gc_task, not per request),
+            # uptime and web sessions
+            buf.extend(_STATUS_TAIL_TMPL % (
+                gc.mem_free() // 1024, gc.mem_alloc() // 1024,
+                int(time.time()), self.sessions.get_session_count()))
+            return bytes(buf)
 
         except Exception as e:
-            logger.error(f"System status error: {e}")
-            return {}
+            _log_error("System status error", e)
+            return b"{}"
     
-    async def _send_response(self, writer, status_code, headers, content):
-        """Send HTTP response with chunked encoding."""
-        try:
-            # Status line
-            status_text = {
-                200: "OK", 201: "Created", 400: "Bad Request",
-                404: "Not Found", 500: "Internal Server Error"
-            }.get(status_code, "Unknown")
-            
-            status_line = f"HTTP/1.1 {status_code} {status_text}\r\n"
-            writer.write(status_line.encode())
-            
-            # Headers with chunked encoding
-            headers['Transfer-Encoding'] = 'chunked'
-            for header, value in headers.items():
-                writer.write(f"{header}: {value}\r\n".encode())
-            
-            writer.write(b"\r\n")
-            
-            # Convert content to bytes
-            if isinstance(content, str):
-                content = content.encode()
-            
-            # Send chunks
-            for i in range(0, len(content), self.chunk_size):
-                chunk = content[i:i + self.chunk_size]
-                writer.write(f"{len(chunk):x}\r\n".encode())
-                writer.write(chunk)
-                writer.write(b"\r\n")
-                await writer.drain()
-            
-            # Final chunk
-            writer.write(b"0\r\n\r\n")
-            await writer.drain()
-            
-        except Exception as e:
-            logger.error(f"Send response error: {e}")
+    async def _send_response(self, writer, status_code, headers, content, keep):
+        """Send HTTP response with a Content-Length body.
 
-    async def _handle_request(self, reader, writer):
-        """Handle individual HTTP request."""
-        client_ip = "unknown"
-        try:
-            # Get client IP
-            peername = writer.get_extra_info('peername')
-            if peername:
-                client_ip = peername[0]
+        All responses are fully known before sending, so the whole
+        response goes out with a single write/drain. Write errors
+        propagate so the caller closes the connection.
 
-            # Register session access
-            self.sessions.register_access(client_ip)
+        Args:
+            writer: Stream writer for the connection
+            status_code: HTTP status code
+            headers: Pre-encoded header lines (e.g. _HDRS_JSON)
+            content: Body as str, bytes or memoryview
+            keep: Whether the connection stays open after this response
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
 
-            # Read request line
-            request_line = await reader.readline()
-            if not request_line:
-                return
+        # bytearray.extend takes any buffer (content may be a memoryview)
+        buf = bytearray(_STATUS_LINES.get(status_code) or _STATUS_LINES[500])
+        buf.extend(headers)
+        buf.extend(_HDR_CONNECTION[keep])
+        buf.extend(_content_length_header(len(content)))
+        buf.extend(b"\r\n")
+        buf.extend(content)
+        await _write(writer, buf)
 
-            request_line = request_line.decode().strip()
-            if not request_line:
-                return
+    async def _read_request_head(self, reader, buf):
+        """Read the request head into a pooled buffer.
 
-            # Parse request
-            parts = request_line.split(' ')
-            if len(parts) < 2:
-                await self._send_error(writer, 400, "Bad Request")
-                return
+        Args:
+            reader: Stream reader for the connection
+            buf: bytearray to fill
 
-            method, path = parts[0], parts[1]
+        Returns:
+            int: Number of bytes read (0 if client sent nothing)
+        """
+        mv = memoryview(buf)
+        size = len(buf)
+        n = 0
+        while n < size:
+            got = await reader.readinto(mv[n:])
+            if not got:
+                break
+            prev = n
+            n += got
+            # The blank line may be followed by a body in the same segment;
+            # search the new bytes plus 3 before them (split terminator)
+            if bytes(mv[max(0, prev - 3):n]).find(b"\r\n\r\n") >= 0:
+                break
+        return n
+
+    async def _handle_request(self, writer, buf, n, client_ip, key, allow_keep):
+        """Handle one HTTP request whose head is in buf.
+
+        Whether the connection persists is decided before anything is
+        sent, so the response's Connection header always matches it.
 
-            # Read headers (skip for efficiency)
-            while True:
-                header_line = await reader.readline()
-                if not header_line or header_line == b"\r\n":
-                    break
+        Args:
+            writer: Stream writer for the connection
+            buf: Pooled buffer holding the request head
+            n: Number of valid bytes in buf
+            client_ip: Client IP address as string
+            key: Session key for client_ip
+            allow_keep: False if the server will close after this request
+
+        Returns:
+            bool: True if the connection can stay open for another request
+        """
+        try:
+            # Register session access
+            self.sessions.register_key(key)
+
+            # Parse "METHOD PATH VERSION" as bytes. Only the start of the
+            # buffer is copied out; headers are read in place.
+            head = bytes(memoryview(buf)[:min(n, REQUEST_LINE_MAX)])
+            request_line = head.partition(b"\r\n")[0]
+            method, _, rest = request_line.partition(b" ")
+            path, _, version = rest.partition(b" ")
+            if not method or not path:
+                await self._send_error(writer, 400)
+                return False
 
             # Route request
-            if path == '/' or path == '/index.html':
-                await self._handle_main_page(writer)
-            elif path == '/api/data':
-                await self._handle_api_data(writer)
-            elif path == '/api/status':
-                await self._handle_api_status(writer)
-            elif path == '/api/heartbeat':
-                await self._handle_api_heartbeat(writer, client_ip)
-            elif path == '/api/wake':
-                await self._handle_api_wake(writer)
-            else:
-                await self._send_error(writer, 404, "Not Found")
+            handler = self._routes.get(path)
+            if handler is None:
+                await self._send_error(writer, 404)
+                return False
+            keep = allow_keep and _keep_alive(buf, n, version)
+            return await handler(writer, client_ip, keep)
 
         except Exception as e:
-            logger.error(f"Request error from {client_ip}: {e}")
-        finally:
-            try:
-                await writer.wait_closed()
-            except Exception:
-                pass
-            self.active_connections -= 1
+            _log_error("Request error", e, client_ip)
+            return False
     
-    async def _handle_main_page(self, writer):
+    async def _handle_main_page(self, writer, client_ip, keep):
         """Handle main page request."""
+        head = self._html_heads[keep]
         try:
-            html_content = self._get_html_template()
-            headers = {
-                'Content-Type': 'text/html; charset=utf-8',
-                'Cache-Control': 'no-cache'
-            }
-            await self._send_response(writer, 200, headers, html_content)
+            writer.write(head)
+            head = None
+            if self._html_body is None:
+                await self._send_html_gz(writer)
+            else:
+                await _write(writer, self._html_body)
+            return keep
         except Exception as e:
-            logger.error(f"Main page error: {e}")
-            await self._send_error(writer, 500, "Internal Server Error")
+            _log_error("Main page error", e)
+            # A 500 after the 200 head would corrupt the response; once
+            # anything is sent, just close the connection
+            if head is not None:
+                await self._send_error(writer, 500)
+            return False
 
-    async def _handle_api_data(self, writer):
+    async def _send_html_gz(self, writer):
+        """Stream the gzip-compressed main page body from flash.
+
+        Accept-Encoding is not checked; every browser takes gzip.
+        """
+        buf = self._file_buf
+        mv = memoryview(buf)
+        with open(HTML_GZ_PATH, 'rb') as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                # Always drain: it is the loop's only yield to the display,
+                # input and sensor tasks
+                writer.write(mv[:n])
+                await writer.drain()
+
+    async def _handle_api_data(self, writer, client_ip, keep):
         """Handle API data request."""
         try:
-            data = self._get_sensor_data()
-            json_content = ujson.dumps(data)
-            headers = {
-                'Content-Type': 'application/json',
-                'Cache-Control': 'no-cache'
-            }
-            await self._send_response(writer, 200, headers, json_content)
+            body = self.cache.pack_api_json()
+            await self._send_response(writer, 200, _HDRS_JSON, body, keep)
+            return keep
         except Exception as e:
-            logger.error(f"API data error: {e}")
-            await self._send_error(writer, 500, "Internal Server Error")
+            _log_error("API data error", e)
+            await self._send_error(writer, 500)
+            return False
 
-    async def _handle_api_status(self, writer):
+    async def _handle_api_status(self, writer, client_ip, keep):
         """Handle API status request."""
         try:
-            status = self._get_system_status()
-            json_content = ujson.dumps(status)
-            headers = {
-                'Content-Type': 'application/json',
-                'Cache-Control': 'no-cache'
-            }
-            await self._send_response(writer, 200, headers, json_content)
+            now = time.ticks_ms()
+            body = self._status_body
+            if body is None or time.ticks_diff(now, self._status_ts) >= STATUS_CACHE_MS:
+                body = self._get_system_status()
+                self._status_body = body
+                self._status_ts = now
+            await self._send_response(writer, 200, _HDRS_JSON_1S, body, keep)
+            return keep
         except Exception as e:
-            logger.error(f"API status error: {e}")
-            await self._send_error(writer, 500, "Internal Server Error")
+            _log_error("API status error", e)
+            await self._send_error(writer, 500)
+            return False
 
-    async def _handle_api_heartbeat(self, writer, client_ip):
+    async def _handle_api_heartbeat(self, writer, client_ip, keep):
         """Handle heartbeat request."""
         try:
-            self.sessions.register_access(client_ip)
-
-            response = {
-                'status': 'ok',
-                'timestamp': time.time(),
-                'active_sessions': self.sessions.get_session_count()
-            }
-
-            json_content = ujson.dumps(response)
-            headers = {
-                'Content-Type': 'application/json',
-                'Cache-Control': 'no-cache'
-            }
-            await self._send_response(writer, 200, headers, json_content)
+            json_content = _HEARTBEAT_TMPL % (
+                int(time.time()), self.sessions.get_session_count())
+            await self._send_response(writer, 200, _HDRS_JSON, json_content, keep)
+            return keep
         except Exception as e:
-            logger.error(f"Heartbeat error: {e}")
-            await self._send_error(writer, 500, "Internal Server Error")
+            _log_error("Heartbeat error", e)
+            await self._send_error(writer, 500)
+            return False
 
-    async def _handle_api_wake(self, writer):
+    async def _handle_api_wake(self, writer, client_ip, keep):
         """Handle APC1 wake request."""
         try:
-            if self.apc1_power:
-                self.apc1_power.enable()
+            apc1_power = self.apc1_power
+            if apc1_power:
+                apc1_power.enable()
+                json_content = _WAKE_OK_TMPL % int(time.time())
+            else:
+                json_content = _WAKE_ERROR_BODY
 
-                if self.wake_callback:
-                    self.wake_callback("web_wake")
+            await self._send_response(writer, 200, _HDRS_JSON, json_content, keep)
 
-                response = {
-                    'status': 'ok',
-                    'message': 'APC1 wake initiated',
-                    'timestamp': time.time()
-                }
-            else:
-                response = {
-                    'status': 'error',
-                    'message': 'APC1 power control not available'
-                }
-
-            json_content = ujson.dumps(response)
-            headers = {
-                'Content-Type': 'application/json',
-                'Cache-Control': 'no-cache'
-            }
-            await self._send_response(writer, 200, headers, json_content)
+            # Display/sensor wake-up runs after the reply is on the wire
+            wake = self.wake_callback
+            if apc1_power and wake is not None:
+                wake("web_wake")
+            return keep
         except Exception as e:
-            logger.error(f"APC1 wake error: {e}")
-            await self._send_error(writer, 500, "Internal Server Error")
+            _log_error("APC1 wake error", e)
+            await self._send_error(writer, 500)
+            return False
     
-    async def _send_error(self, writer, status_code, message):
-        """Send error response."""
-        try:
-            error_html = f"""<!DOCTYPE html>
-<html>
-<head><title>Error {status_code}</title></head>
-<body>
-    <h1>Error {status_code}</h1>
-    <p>{message}</p>
-    <hr>
-    <p>Pico Weather Station</p>
-</body>
-</html>"""
-            
-            headers = {'Content-Type': 'text/html'}
-            await self._send_response(writer, status_code, headers, error_html)
-        except Exception as e:
-            logger.error(f"Error response failed: {e}")
+    async def _send_error(self, writer, status_code):
+        """Send a precomputed error response (400, 404, 500 or 503)."""
+        await _write(writer, _ERROR_RESPONSES.get(status_code) or _ERROR_RESPONSES[500])
+
+    async def _sweep_deadlines(self):
+        """Cancel client handlers that overran the response timeout.
+
+        One shared periodic check replaces a wait_for() timer per request.
+        """
+        deadlines = self._conn_deadlines
+        while self.running:
+            await asyncio.sleep(1)
+            if not deadlines:
+                continue
+            now = time.ticks_ms()
+            for task, deadline in list(deadlines.items()):
+                if time.ticks_diff(now, deadline) >= 0:
+                    del deadlines[task]
+                    task.cancel()
+
+    async def _gc_task(self):
+        """Collect garbage periodically, only while no request is in flight."""
+        while self.running:
+            await asyncio.sleep(GC_INTERVAL)
+            # Idle keep-alive connections don't count as busy
+            if self.active_connections == len(self._idle_tasks):
+                gc.collect()
 
     async def _client_handler(self, reader, writer):
-        """Handle client connection with connection tracking."""
+        """Serve a client connection, including keep-alive requests.
+
+        Each connection needs a pooled buffer. When all max_connections
+        buffers are in use, an idle keep-alive connection is reclaimed;
+        if none is idle the client gets a 503 instead of queueing.
+        """
+        pool = self._buf_pool
+        idle_tasks = self._idle_tasks
+        if not pool and idle_tasks:
+            for idle in idle_tasks:
+                idle.cancel()
+                break
+            await asyncio.sleep(0)  # Let it release its buffer
+        if not pool:
+            await self._reject_busy(writer)
+            return
         self.active_connections += 1
+        buf = pool.pop()
+        _set_nodelay(writer)
+        task = asyncio.current_task()
+        deadlines = self._conn_deadlines
+        deadlines[task] = time.ticks_add(
+            time.ticks_ms(), self.response_timeout * 1000)
+        client_ip = "unknown"
+        served = 0
         try:
-            await asyncio.wait_for(
-                self._handle_request(reader, writer),
-                timeout=RESPONSE_TIMEOUT
-            )
-        except asyncio.TimeoutError:
-            logger.warn("Client timeout")
+            peername = writer.get_extra_info('peername')
+            if peername:
+                client_ip = peername[0]
+            key = self.sessions.client_key(client_ip)
+
+            while True:
+                n = await self._read_request_head(reader, buf)
+                if not n:
+                    break
+                idle_tasks.discard(task)
+                deadlines[task] = time.ticks_add(
+                    time.ticks_ms(), self.response_timeout * 1000)
+                served += 1
+                keep = await self._handle_request(
+                    writer, buf, n, client_ip, key,
+                    served < KEEPALIVE_MAX and self.running)
+                if not keep:
+                    break
+
+                # Wait for the next request on this connection
+                idle_tasks.add(task)
+                deadlines[task] = time.ticks_add(time.ticks_ms(), KEEPALIVE_IDLE_MS)
+        except asyncio.CancelledError:
+            # Idle keep-alive connections are closed this way on purpose
+            if task not in idle_tasks:
+                logger.warn("Client timeout")
         except Exception as e:
-            logger.error(f"Client handler error: {e}")
+            _log_error("Client handler error", e)
         finally:
-            self.active_connections -= 1
+            idle_tasks.discard(task)
+            deadlines.pop(task, None)
+            pool.append(buf)
             try:
                 writer.close()
-                await writer.wait_closed()
             except Exception:
                 pass
+            # Free the slot now; the FIN handshake completes in the background
+            self.active_connections -= 1
+            asyncio.create_task(self._drain_close(writer))
+
+    async def _reject_busy(self, writer):
+        """Answer 503 and close when no connection slot is free."""
+        try:
+            await _write(writer, _ERROR_RESPONSES[503])
+        except Exception:
+            pass
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+    async def _drain_close(self, writer):
+        """Wait for a closed connection to finish shutting down."""
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
 
     async def start(self):
         """Start the webserver."""
         try:
             self.running = True
+            self._stop_event.clear()
             self.server = await asyncio.start_server(
                 self._client_handler,
                 '0.0.0.0',
-                self.port
+                self.port,
+                backlog=self.backlog
             )
+            self._sweeper = asyncio.create_task(self._sweep_deadlines())
+            self._gc_worker = asyncio.create_task(self._gc_task())
             logger.info(f"WebServer started on port {self.port}")
         except Exception as e:
             logger.error(f"WebServer start error: {e}")
@@ -814,6 +841,13 @@ footer { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 15
         """Stop the webserver."""
         try:
             self.running = False
+            self._stop_event.set()
+            if self._sweeper:
+                self._sweeper.cancel()
+                self._sweeper = None
+            if self._gc_worker:
+                self._gc_worker.cancel()
+                self._gc_worker = None
             if self.server:
                 self.server.close()
                 await self.server.wait_closed()
@@ -821,6 +855,10 @@ footer { background: rgba(255, 255, 255, 0.95); border-radius: 15px; padding: 15
         except Exception as e:
             logger.error(f"WebServer stop error: {e}")
 
+    async def wait_stopped(self):
+        """Block until stop() is called."""
+        await self._stop_event.wait()
+
 
 # Webserver task for integration with main async loop
 async def webserver_task(sensor_cache, apc1_power=None, wake_callback=None, config=None):
@@ -844,9 +882,8 @@ async def webserver_task(sensor_cache, apc1_power=None, wake_callback=None, conf
         # Start webserver
         await webserver.start()
 
-        # Keep task running
-        while webserver.running:
-            await asyncio.sleep(1)
+        # Keep task running until stopped
+        await webserver.wait_stopped()
 
     except Exception as e:
         logger.error(f"Webserver task error: {e}")
@@ -6,7 +6,6 @@ without risking corruption of the main settings.json configuration file.
 """
 
 import json
-import os
 import logger
 
 WIFI_FILE = "wifi.json"
@@ -22,9 +21,11 @@ def load_wifi_config():
         dict: WiFi config with ssid, password, retry_interval_s
     """
     try:
-        if WIFI_FILE in os.listdir():
-            with open(WIFI_FILE, "r") as f:
-                return json.load(f)
+        # Open directly instead of listing the filesystem to check first
+        with open(WIFI_FILE, "r") as f:
+            return json.load(f)
+    except OSError:
+        pass  # No wifi.json yet
     except Exception as e:
         logger.error(f"WiFi config load error: {e}")
     
@@ -47,7 +48,7 @@ def save_wifi_config(wifi_cfg):
     """
     try:
         with open(WIFI_FILE, "w") as f:
-            json.dump(wifi_cfg, f)
+            f.write(json.dumps(wifi_cfg))
         return True
     except Exception as e:
         logger.error(f"Failed to save WiFi config: {e}")
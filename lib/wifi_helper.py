@@ -1,4 +1,6 @@
-import network, socket, time, machine
+import gc, network, select, socket, time, machine
+from binascii import unhexlify
+from micropython import const
 
 try:
     import uasyncio as asyncio
@@ -7,9 +9,22 @@ except ImportError:
 
 import logger
 
+# Set True to log setup form parsing details
+_DEBUG = const(False)
+
 # Global WLAN instance
 _wlan = None
 
+# wlan.status() codes that won't resolve by waiting, or () where the
+# port doesn't define them
+try:
+    _STAT_FAILED = (network.STAT_WRONG_PASSWORD, network.STAT_NO_AP_FOUND)
+except AttributeError:
+    _STAT_FAILED = ()
+
+_CONNECT_POLL_MS = const(20)
+_AP_READY_TIMEOUT_S = const(5)
+
 def get_wlan():
     """Get the global WLAN instance (creates if needed)."""
     global _wlan
@@ -40,23 +55,33 @@ def get_status():
         dict: Status info with keys: connected, ip, ssid, rssi
     """
     wlan = get_wlan()
-    if not wlan.active():
+    if not (wlan.active() and wlan.isconnected()):
         return {"connected": False, "ip": None, "ssid": None, "rssi": None}
     
-    status = {
-        "connected": wlan.isconnected(),
-        "ip": wlan.ifconfig()[0] if wlan.isconnected() else None,
-        "ssid": wlan.config('essid') if wlan.isconnected() else None,
-        "rssi": wlan.status('rssi') if wlan.isconnected() else None
+    return {
+        "connected": True,
+        "ip": wlan.ifconfig()[0],
+        "ssid": wlan.config('essid'),
+        "rssi": wlan.status('rssi')
     }
-    return status
+
+def get_status_fast():
+    """Get connection state and IP without building a status dict.
+    
+    Returns:
+        tuple: (connected, ip) where ip is None when not connected
+    """
+    wlan = get_wlan()
+    if wlan.active() and wlan.isconnected():
+        return True, wlan.ifconfig()[0]
+    return False, None
 
 def connect(ssid, password, oled=None):
     """Synchronous WiFi connection (legacy compatibility)."""
     wlan = get_wlan()
     wlan.active(True)
     wlan.connect(ssid, password)
-    for _ in range(30):
+    for _ in range(15000 // _CONNECT_POLL_MS):
         if wlan.isconnected():
             ip = wlan.ifconfig()[0]
             logger.info(f"Connected, IP: {ip}")
@@ -64,7 +89,9 @@ def connect(ssid, password, oled=None):
                 oled.text(ip, 0, 36)
                 oled.show()
             return True
-        time.sleep(0.5)
+        if wlan.status() in _STAT_FAILED:
+            break
+        time.sleep_ms(_CONNECT_POLL_MS)
     wlan.disconnect()
     wlan.active(False)
     return False
@@ -81,8 +108,6 @@ async def connect_async(ssid, password, timeout_s=15, oled=None):
     Returns:
         bool: True if connected, False otherwise
     """
-    import gc
-    
     wlan = get_wlan()
     wlan.active(True)
     
@@ -100,8 +125,8 @@ async def connect_async(ssid, password, timeout_s=15, oled=None):
     wlan.connect(ssid, password)
     
     # Wait for connection with timeout
-    attempts = timeout_s * 2  # Check every 0.5s
-    for i in range(attempts):
+    attempts = timeout_s * 1000 // _CONNECT_POLL_MS
+    for _ in range(attempts):
         if wlan.isconnected():
             ip = wlan.ifconfig()[0]
             logger.info(f"✓ WiFi connected! IP: {ip}")
@@ -112,10 +137,16 @@ async def connect_async(ssid, password, timeout_s=15, oled=None):
                 oled.show()
                 # Don't sleep here - could be called before event loop starts
             return True
-        await asyncio.sleep(0.5)
+        # Bad password / unknown SSID won't fix itself; stop waiting
+        stat = wlan.status()
+        if stat in _STAT_FAILED:
+            logger.warn(f"⚠ WiFi connection failed (status {stat})")
+            break
+        await asyncio.sleep_ms(_CONNECT_POLL_MS)
+    else:
+        logger.warn("⚠ WiFi connection timeout")
     
     # Connection failed
-    logger.warn("⚠ WiFi connection timeout")
     if oled:
         oled.fill(0)
         oled.text("WiFi timeout", 0, 0)
@@ -136,100 +167,131 @@ def disconnect():
         wlan.active(False)
     logger.info("WiFi disconnected")
 
-def start_config_ap(ap_ssid="PICO_SETUP", ap_password="12345678", on_save=None, oled=None):
-    """Start WiFi access point for configuration with robust error handling."""
+def _content_length(req, end):
+    """Return the Content-Length value from a raw request head.
+    
+    Args:
+        req: Raw request bytes
+        end: Offset of the blank line ending the headers
+    
+    Returns:
+        int: Declared body length, or 0 if absent/invalid
+    """
+    i = req.find(b"Content-Length:", 0, end)
+    if i < 0:
+        return 0
+    i += 15
+    j = req.find(b"\r\n", i, end)
     try:
-        logger.info("Starting AP mode...")
-        if oled:
-            oled.fill(0)
-            oled.text("Starting AP...", 0, 0)
-            oled.show()
-        
-        # Disable station mode first to avoid conflicts
-        wlan = get_wlan()
-        if wlan.active():
-            wlan.active(False)
-            logger.info("Disabled station mode")
-        
-        # Create and configure AP
-        ap = network.WLAN(network.AP_IF)
-        
-        # Reset AP interface to clean state
-        ap.active(False)
-        time.sleep(0.5)
-        
-        # Activate AP with error handling
-        try:
-            ap.active(True)
-            logger.info("AP interface activated")
-        except Exception as e:
-            logger.error(f"Failed to activate AP interface: {e}")
-            if oled:
-                oled.fill(0)
-                oled.text("AP Error!", 0, 0)
-                oled.text("Reset device", 0, 12)
-                oled.show()
-            time.sleep(2)
-            machine.reset()
-        
-        # Wait for AP to be ready with timeout
-        ap_ready_timeout = 5  # 5 seconds
-        start_time = time.time()
-        while not ap.active():
-            if time.time() - start_time > ap_ready_timeout:
-                logger.error("AP activation timeout")
-                if oled:
-                    oled.fill(0)
-                    oled.text("AP Timeout!", 0, 0)
-                    oled.text("Reset device", 0, 12)
-                    oled.show()
-                time.sleep(2)
-                machine.reset()
-            time.sleep(0.1)
-        
-        # Configure AP with error handling
-        try:
-            ap.config(essid=ap_ssid, password=ap_password)
-            logger.info(f"AP configured: {ap_ssid}")
-        except Exception as e:
-            logger.error(f"Failed to configure AP: {e}")
-            if oled:
-                oled.fill(0)
-                oled.text("AP Config Error!", 0, 0)
-                oled.text("Reset device", 0, 12)
-                oled.show()
-            time.sleep(2)
-            machine.reset()
-        
-        # Get IP address with error handling
-        ip = "192.168.4.1"  # Default Pico W AP IP
-        try:
-            ip = ap.ifconfig()[0]
-            logger.info(f"AP IP: {ip}")
-        except Exception as e:
-            logger.error(f"Failed to get AP IP: {e}")
-        
-        logger.info(f"AP started successfully: {ap_ssid} @ {ip}")
-        
-        if oled:
-            oled.fill(0)
-            oled.text("Wi-Fi Setup", 0, 0)
-            oled.text(ap_ssid, 0, 12)
-            oled.text("Pwd: 12345678", 0, 24)
-            oled.text(ip, 0, 36)
-            oled.show()
+        return int(req[i:j if j >= 0 else end])
+    except ValueError:
+        return 0
 
-    except Exception as e:
-        logger.error(f"Critical error in AP setup: {e}")
-        if oled:
-            oled.fill(0)
-            oled.text("AP Setup Failed", 0, 0)
-            oled.text("Reset device", 0, 12)
-            oled.show()
-        time.sleep(3)
-        machine.reset()
+def _read_request(cl, buf):
+    """Read a whole setup request, headers and body, into buf.
+    
+    Reads until the blank line ending the headers, then until the
+    declared Content-Length of body has arrived (or the peer closes).
+    Data goes straight into the preallocated buffer via readinto, so
+    the request is never rebuilt by concatenation.
+    
+    Args:
+        cl: Accepted client socket
+        buf: bytearray of _AP_MAX_REQUEST bytes to fill
+    
+    Returns:
+        tuple: (bytes read, offset of the header terminator or -1);
+        bytes read is -1 if the request doesn't fit in buf
+    """
+    mv = memoryview(buf)
+    size = len(buf)
+    n = 0
+    sep = -1
+    while sep < 0:
+        if n == size:
+            return -1, -1
+        got = cl.readinto(mv[n:])
+        if not got:
+            return n, -1
+        # Only rescan the new bytes (plus 3 in case the CRLFCRLF straddles)
+        start = n - 3 if n > 3 else 0
+        n += got
+        sep = bytes(mv[start:n]).find(b"\r\n\r\n")
+        if sep >= 0:
+            sep += start
+    
+    total = sep + 4 + _content_length(bytes(mv[:sep]), sep)
+    if total > size:
+        return -1, -1
+    while n < total:
+        got = cl.readinto(mv[n:total])
+        if not got:  # Connection closed
+            break
+        n += got
+    return n, sep
 
-    html = """<!DOCTYPE html>
+def _url_decode(value):
+    """Decode a form-urlencoded value ('+' and %XX escapes).
+    
+    Each escape is decoded by binascii.unhexlify in C instead of an
+    int()/chr() round trip per character.
+    
+    Args:
+        value: Raw field bytes
+    
+    Returns:
+        str: Decoded value (malformed escapes are kept as-is; invalid
+            UTF-8 falls back to one character per byte)
+    """
+    parts = value.replace(b"+", b" ").split(b"%")
+    out = bytearray(parts[0])
+    for i in range(1, len(parts)):
+        part = parts[i]
+        if len(part) >= 2:
+            try:
+                out.extend(unhexlify(part[:2]))
+                out.extend(part[2:])
+                continue
+            except ValueError:
+                pass
+        out.extend(b"%")
+        out.extend(part)
+    try:
+        return out.decode()
+    except UnicodeError:
+        # e.g. a truncated multi-byte escape; decode like the old parser
+        return "".join(map(chr, out))
+
+def _form_value(data, key):
+    """Return one decoded field from an urlencoded form body.
+    
+    Scans the raw body for ``key`` (e.g. b"ssid=") at the start or
+    after an '&' and slices up to the next '&', so no per-pair strings
+    or dict are built.
+    
+    Args:
+        data: Raw form body bytes
+        key: Field name including the trailing '='
+    
+    Returns:
+        str: Decoded value, or "" if the field is missing
+    """
+    i = 0
+    while True:
+        i = data.find(key, i)
+        if i < 0:
+            return ""
+        if i == 0 or data[i - 1] == 0x26:  # b"&"
+            break
+        i += 1
+    i += len(key)
+    j = data.find(b"&", i)
+    if j < 0:
+        j = len(data)
+    return _url_decode(data[i:j])
+
+# Setup page served by the config AP, built once as a complete response
+_AP_HTML = b"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -330,117 +392,184 @@ def start_config_ap(ap_ssid="PICO_SETUP", ap_password="12345678", on_save=None,
     </div>
 </body>
 </html>"""
+_AP_HTML_RESP = (b"HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n"
+                 b"Content-Length: %d\r\n\r\n" % len(_AP_HTML)) + _AP_HTML
+del _AP_HTML
+
+# Fixed replies for the form POST
+_AP_SAVED_RESP = b"HTTP/1.0 200 OK\r\n\r\nSaved. Rebooting..."
+_AP_NO_SSID_RESP = b"HTTP/1.0 400 Bad Request\r\n\r\nError: SSID cannot be empty"
+_AP_TOO_LARGE_RESP = b"HTTP/1.0 413 Payload Too Large\r\n\r\nRequest too large"
+_AP_FORM_ERROR_RESP = b"HTTP/1.0 500 Internal Server Error\r\n\r\nError processing form"
+
+_AP_ADDR = ("0.0.0.0", 80)
+_AP_POLL_MS = const(1000)
+_AP_CLIENT_TIMEOUT_S = const(5)
+_AP_MAX_REQUEST = const(2048)  # Request buffer size; larger requests get 413
+
+def _oled_err(oled, line1, line2="Reset device"):
+    """Show a two-line AP setup error, then reset the board.
+    
+    Args:
+        oled: Optional OLED display
+        line1: Error title
+        line2: Second line
+    """
+    if oled:
+        oled.fill(0)
+        oled.text(line1, 0, 0)
+        oled.text(line2, 0, 12)
+        oled.show()
+    # Long enough to catch the message; recovery is the reset itself
+    time.sleep_ms(500)
+    machine.reset()
+
+def start_config_ap(ap_ssid="PICO_SETUP", ap_password="12345678", on_save=None, oled=None):
+    """Start WiFi access point for configuration with robust error handling."""
+    try:
+        logger.info("Starting AP mode...")
+        if oled:
+            oled.fill(0)
+            oled.text("Starting AP...", 0, 0)
+            oled.show()
+        
+        # Disable station mode first to avoid conflicts
+        wlan = get_wlan()
+        if wlan.active():
+            wlan.active(False)
+            logger.info("Disabled station mode")
+        
+        # Create and configure AP
+        ap = network.WLAN(network.AP_IF)
+        
+        # Reset AP interface to clean state
+        ap.active(False)
+        time.sleep(0.5)
+        
+        # Activate AP with error handling
+        try:
+            ap.active(True)
+            logger.info("AP interface activated")
+        except Exception as e:
+            logger.error(f"Failed to activate AP interface: {e}")
+            _oled_err(oled, "AP Error!")
+        
+        # Wait for AP to be ready with timeout
+        start_time = time.time()
+        while not ap.active():
+            if time.time() - start_time > _AP_READY_TIMEOUT_S:
+                logger.error("AP activation timeout")
+                _oled_err(oled, "AP Timeout!")
+            time.sleep(0.1)
+        
+        # Configure AP with error handling
+        try:
+            ap.config(essid=ap_ssid, password=ap_password)
+            logger.info(f"AP configured: {ap_ssid}")
+        except Exception as e:
+            logger.error(f"Failed to configure AP: {e}")
+            _oled_err(oled, "AP Config Error!")
+        
+        # Get IP address with error handling
+        ip = "192.168.4.1"  # Default Pico W AP IP
+        try:
+            ip = ap.ifconfig()[0]
+            logger.info(f"AP IP: {ip}")
+        except Exception as e:
+            logger.error(f"Failed to get AP IP: {e}")
+        
+        logger.info(f"AP started successfully: {ap_ssid} @ {ip}")
+        
+        if oled:
+            oled.fill(0)
+            oled.text("Wi-Fi Setup", 0, 0)
+            oled.text(ap_ssid, 0, 12)
+            oled.text("Pwd: 12345678", 0, 24)
+            oled.text(ip, 0, 36)
+            oled.show()
+
+    except Exception as e:
+        logger.error(f"Critical error in AP setup: {e}")
+        _oled_err(oled, "AP Setup Failed")
+
 
-    addr = socket.getaddrinfo("0.0.0.0", 80)[0][-1]
     s = socket.socket()
-    s.bind(addr)
+    s.bind(_AP_ADDR)
     s.listen(1)
+    # Wait for clients with poll() rather than parking in accept()
+    s.setblocking(False)
+    poller = select.poll()
+    poller.register(s, select.POLLIN)
     logger.info(f"Web config running on {ip}")
 
+    # One request buffer for the whole setup session
+    buf = bytearray(_AP_MAX_REQUEST)
+    mv = memoryview(buf)
+
+    gc.collect()
+
+    served = False
     while True:
-        cl, _ = s.accept()
-        req = cl.recv(1024).decode()
-        if "POST" in req:
+        if served:
+            # Clean up after the last client before waiting for the next
+            gc.collect()
+            served = False
+        if not poller.poll(_AP_POLL_MS):
+            continue
+        try:
+            cl, _ = s.accept()
+        except OSError:
+            continue  # Client went away between poll and accept
+        served = True
+        # A stalled browser must not wedge the setup loop
+        cl.settimeout(_AP_CLIENT_TIMEOUT_S)
+        try:
+            n, sep = _read_request(cl, buf)
+        except OSError as e:
+            logger.warn(f"Setup request read failed: {e}")
+            cl.close()
+            continue
+        if n < 0:
+            logger.warn("Setup request too large")
+            cl.sendall(_AP_TOO_LARGE_RESP)
+            cl.close()
+            continue
+        if n >= 4 and buf[:4] == b"POST":
             try:
-                # DIAGNOSTIC LOGGING
-                logger.info("="*50)
-                logger.info("POST REQUEST RECEIVED")
-                logger.info(f"Initial request length: {len(req)} bytes")
-                
-                # Extract Content-Length if present
-                content_length = 0
-                for line in req.split("\r\n"):
-                    if line.startswith("Content-Length:"):
-                        content_length = int(line.split(":")[1].strip())
-                        logger.info(f"Content-Length header: {content_length} bytes")
-                        break
-                
-                # Split headers from body
-                parts = req.split("\r\n\r\n", 1)
-                if len(parts) > 1:
-                    headers = parts[0]
-                    body = parts[1]
-                    logger.info(f"Initial body length: {len(body)} bytes")
-                    
-                    # If we have Content-Length and body is incomplete, keep reading
-                    if content_length > 0 and len(body) < content_length:
-                        logger.info(f"Body incomplete, reading more data...")
-                        while len(body) < content_length:
-                            more_data = cl.recv(1024).decode()
-                            body += more_data
-                            logger.info(f"Read {len(more_data)} more bytes, total body: {len(body)} bytes")
-                            if not more_data:  # Connection closed
-                                break
-                    
-                    data = body
-                    logger.info(f"Complete body received: {len(data)} bytes")
+                if sep >= 0:
+                    data = bytes(mv[sep + 4:n])
                 else:
-                    data = ""
+                    data = b""
                     logger.error("Could not find request body separator!")
+                if _DEBUG:
+                    logger.debug(f"Setup POST: {n} bytes, body {len(data)} bytes")
                 
-                logger.info(f"Form data: {repr(data)}")
-                
-                # Parse form data safely, handling edge cases
-                kv = {}
-                pairs = data.split("&")
-                logger.info(f"Split into {len(pairs)} pairs")
-                
-                for pair in pairs:
-                    logger.info(f"Processing pair: {repr(pair)}")
-                    if "=" in pair:
-                        # Split only on first "=" to handle values containing "="
-                        key, value = pair.split("=", 1)
-                        logger.info(f"  Key: {repr(key)}, Value (raw): {repr(value)}")
-                        
-                        # URL decode the value (replace + with space, handle %XX encoding)
-                        value = value.replace("+", " ")
-                        # Basic URL decoding for common characters
-                        try:
-                            # Simple percent-decoding for common cases
-                            while "%" in value:
-                                idx = value.index("%")
-                                if idx + 2 < len(value):
-                                    hex_str = value[idx+1:idx+3]
-                                    try:
-                                        char = chr(int(hex_str, 16))
-                                        value = value[:idx] + char + value[idx+3:]
-                                    except:
-                                        break
-                                else:
-                                    break
-                        except:
-                            pass  # If decoding fails, use value as-is
-                        
-                        logger.info(f"  Value (decoded): {repr(value)}")
-                        kv[key] = value
-                    else:
-                        logger.info(f"  Skipping pair (no '='): {repr(pair)}")
+                # Only the two fields we need are sliced out and decoded
+                ssid = _form_value(data, b"ssid=").strip()
+                password = _form_value(data, b"password=").strip()
                 
-                logger.info(f"Parsed key-value pairs: {list(kv.keys())}")
-                
-                ssid = kv.get("ssid", "").strip()
-                password = kv.get("password", "").strip()
-                
-                logger.info(f"Final SSID: {repr(ssid)}, Password length: {len(password)}")
-                logger.info("="*50)
+                if _DEBUG:
+                    logger.debug(f"Setup SSID: {repr(ssid)}, password length: {len(password)}")
                 
                 if not ssid:
                     logger.error("SSID is empty")
-                    cl.send("HTTP/1.0 400 Bad Request\r\n\r\nError: SSID cannot be empty")
+                    cl.sendall(_AP_NO_SSID_RESP)
                     cl.close()
                     continue
                 
                 if on_save:
                     on_save(ssid, password)
-                cl.send("HTTP/1.0 200 OK\r\n\r\nSaved. Rebooting...")
+                cl.sendall(_AP_SAVED_RESP)
                 cl.close()
                 time.sleep(2)
-                import machine
                 machine.reset()
             except Exception as e:
                 logger.error(f"Form error: {e}")
-                cl.send("HTTP/1.0 500 Internal Server Error\r\n\r\nError processing form")
+                cl.sendall(_AP_FORM_ERROR_RESP)
                 cl.close()
         else:
-            cl.send("HTTP/1.0 200 OK\r\n\r\n" + html)
+            try:
+                cl.sendall(_AP_HTML_RESP)
+            except OSError as e:
+                logger.warn(f"Setup page send failed: {e}")
             cl.close()
@@ -2,11 +2,15 @@
 # Components: APC1, SHTC3, Battery, SSD1306 OLED, Rotary Encoder
 # Includes: Failsafe debug-exit (hold button 1s), Power Mgmt, Wake Logic
 
-import json, time, sys, machine
+import time, sys, machine
 try:
     import micropython
 except ImportError:
     micropython = None
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
 from machine import I2C, Pin
 from ssd1306 import SSD1306_I2C
 from rotary_irq_rp2 import RotaryIRQ
@@ -17,14 +21,12 @@ from config import (
     load_settings,
     FONT_SCALES,
     REFRESH_INTERVALS,
-    SETTINGS_FILE,
     get_apc1_pins,
     get_sleep_times,
 )
-from screens import (available_screens, draw_screen as draw_named_screen,
-                     step_scroll_screen)
+from screens import available_screens, draw_screen as draw_named_screen
+from sensor_cache import SensorCache
 from apc1_power import APC1Power
-from display_utils import show_big
 
 # --- DEBUG Failsafe check (encoder button at startup) ---
 ENC_SW = 20  # encoder button pin
@@ -33,11 +35,12 @@ led = Pin("LED", Pin.OUT)
 
 # 1 second hold detection
 held = True
-for _ in range(10):  # 10×100ms = 1s
-    if btn.value() == 1:
+t0 = time.ticks_ms()
+while time.ticks_diff(time.ticks_ms(), t0) < 1000:
+    if btn.value():
         held = False
         break
-    time.sleep(0.1)
+    time.sleep_ms(100)
 
 if held:
     print("DEBUG: Exited main.py early.")
@@ -68,8 +71,10 @@ try:
     scl = settings["i2c"].get("scl", 17)
     i2c = I2C(0, sda=Pin(sda), scl=Pin(scl), freq=400000)
 
-    # Get sleep times from settings
+    # Get sleep times from settings (compared against ticks_ms below)
     DISPLAY_SLEEP_S, APC1_SLEEP_S = get_sleep_times(settings)
+    DISPLAY_SLEEP_MS = DISPLAY_SLEEP_S * 1000
+    APC1_SLEEP_MS = APC1_SLEEP_S * 1000
 
     oled = SSD1306_I2C(128, 64, i2c, addr=0x3C)
     devices = i2c.scan()
@@ -82,6 +87,7 @@ try:
     apc1 = APC1(i2c, apc1_addr) if has_apc1 else None
     sht = SHTC3(i2c) if has_shtc3 else None
     batt = Battery(adc_pin=26, divider_ratio=2.0)
+    cache = SensorCache()
 
     # Initialize watchdog timer for main loop stability
     from machine import WDT
@@ -120,25 +126,36 @@ rot.set(0)
 
 
 # -------- SCREEN DEFINITIONS --------
-screens = available_screens(sht, apc1)
+screens = available_screens(cache)
 screen_idx, last_val = 0, 0
 
 
 # -------- SCREEN DRAW --------
+def read_sensors():
+    # Screens draw from the cache; fill it straight from the sensors
+    if sht:
+        cache.update_shtc3(*sht.measure())
+    if apc1 and apc1_awake:
+        cache.update_apc1(apc1.read_all())
+    v, p, _ = batt.read()
+    cache.update_battery(v, p)
+
 def draw_screen():
     name = screens[screen_idx][0]
-    draw_named_screen(name, oled, sht, apc1, batt, FONT_SCALES)
+    read_sensors()
+    draw_named_screen(name, oled, cache, FONT_SCALES)
 
 
 # -------- POWER MANAGEMENT --------
-last_activity = time.time()
-last_refresh = 0
+# Monotonic ms timestamps; immune to RTC/NTP adjustments
+last_activity = time.ticks_ms()
+last_refresh = last_activity
 display_on = True
 apc1_awake = True
 
 def wake_up(_=None):
     global display_on, apc1_awake, last_activity
-    last_activity = time.time()
+    last_activity = time.ticks_ms()
     changed = False
 
     # Wake APC1 only if it was asleep
@@ -157,81 +174,106 @@ def wake_up(_=None):
     if changed:
         print("Wake-up triggered")
 
+# Set from the button/encoder IRQs; the main loop sleeps on it
+_event = asyncio.ThreadSafeFlag()
+
 # Replace heavy ISR with lightweight flag-based handler
 _wake_flag = False
 
 def _btn_irq_handler(pin):
-    # Only set a flag; avoid allocations or I2C in ISR
+    # Only set flags; avoid allocations or I2C in ISR
     global _wake_flag
     _wake_flag = True
+    _event.set()
 
 btn.irq(trigger=Pin.IRQ_FALLING, handler=_btn_irq_handler)
+rot.add_listener(_event.set)
+
+# Longest the loop may sleep between watchdog feeds (WDT is 8 s)
+WDT_FEED_MS = 4000
 
 
 # -------- MAIN LOOP --------
-draw_screen()
+async def main():
+    global screen_idx, last_val, last_refresh, last_activity
+    global display_on, apc1_awake, _wake_flag
+
+    draw_screen()
+    last_refresh = time.ticks_ms()
+
+    # Bind hot-loop globals/attributes to locals once
+    _ticks_ms = time.ticks_ms
+    _ticks_diff = time.ticks_diff
+    _rot_value = rot.value
+    _screens = screens
+    _n_screens = len(screens)
+    _intervals = REFRESH_INTERVALS
+    _wait = _event.wait
+    _wait_for_ms = asyncio.wait_for_ms
 
-try:
     while True:
-        now = time.time()
+        now = _ticks_ms()
 
-        # Handle deferred wake-up from IRQ
-        if _wake_flag:
-            _wake_flag = False
-            wake_up()
-
-        val = rot.value()
+        val = _rot_value()
         if val != last_val:
             last_activity = now
             wake_up()
             if val > last_val:
-                screen_idx = (screen_idx + 1) % len(screens)
+                screen_idx = (screen_idx + 1) % _n_screens
             else:
-                screen_idx = (screen_idx - 1) % len(screens)
+                screen_idx = (screen_idx - 1) % _n_screens
             draw_screen()
             last_val = val
 
-        if not btn.value():
+        screen_name = _screens[screen_idx][0]
+
+        # Handle deferred button press from IRQ (wake only; the settings
+        # menus live in main_async.py)
+        if _wake_flag:
+            _wake_flag = False
             last_activity = now
             wake_up()
-            if screens[screen_idx][0] == "resetwifi":
-                s = load_settings()
-                s["wifi"] = {"ssid": "", "password": ""}
-                with open(SETTINGS_FILE, "w") as f:
-                    json.dump(s, f)
-                show_big(oled, ["Wi-Fi reset!", "Reboot to setup"], [1.5, 1])
-                time.sleep(2)
-
-        screen_name = screens[screen_idx][0]
-        
-        # Handle scrolling screen separately
-        if screen_name == "scroll":
-            # Step the scrolling marquee (pass sensors for periodic refresh)
-            step_scroll_screen(oled, sht, apc1, batt, now)
-            oled.show()
-        else:
-            # Regular refresh for other screens
-            interval = REFRESH_INTERVALS.get(screen_name, 0)
-            if interval > 0 and now - last_refresh > interval:
+
+        wait_ms = WDT_FEED_MS
+
+        # Periodic refresh
+        interval = _intervals.get(screen_name, 0)
+        if interval > 0:
+            interval_ms = interval * 1000
+            if _ticks_diff(now, last_refresh) >= interval_ms:
                 draw_screen()
                 last_refresh = now
+            wait_ms = min(wait_ms, interval_ms - _ticks_diff(now, last_refresh))
+
+        idle_ms = _ticks_diff(now, last_activity)
+        if display_on:
+            if idle_ms > DISPLAY_SLEEP_MS:
+                oled.poweroff()
+                display_on = False
+                print("Display off")
+            else:
+                wait_ms = min(wait_ms, DISPLAY_SLEEP_MS + 1 - idle_ms)
 
-        idle_time = now - last_activity
-        if display_on and idle_time > DISPLAY_SLEEP_S:
-            oled.poweroff()
-            display_on = False
-            print("Display off")
-
-        if apc1_awake and idle_time > APC1_SLEEP_S:
-            apc1_power.disable()
-            apc1_awake = False
-            print("APC1 sleep")
+        if apc1_awake:
+            if idle_ms > APC1_SLEEP_MS:
+                apc1_power.disable()
+                apc1_awake = False
+                print("APC1 sleep")
+            else:
+                wait_ms = min(wait_ms, APC1_SLEEP_MS + 1 - idle_ms)
 
         # Feed watchdog to prevent reset
         wdt.feed()
 
-        time.sleep(0.05)
+        # Sleep until the encoder/button fires or the next deadline is due
+        try:
+            await _wait_for_ms(_wait(), max(wait_ms, 0))
+        except asyncio.TimeoutError:
+            pass
 
+
+try:
+    asyncio.run(main())
 except KeyboardInterrupt:
     oled.fill(0)    
     oled.text("Stopped", 0, 20)
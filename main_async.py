@@ -23,6 +23,18 @@ def log_memory(label):
     used = gc.mem_alloc() / 1024
     logger.debug(f"[{label}] MEM: {free:.1f}KB free, {used:.1f}KB used")
 
+def show_error(oled, title, e):
+    """Draw an error title and a short message for exception e on the OLED.
+
+    Collects garbage first and uses a fixed message for MemoryError, so the
+    report does not itself fail when the heap is exhausted.
+    """
+    gc.collect()
+    oled.fill(0)
+    oled.text(title, 0, 0)
+    oled.text("Out of memory" if isinstance(e, MemoryError) else str(e)[:20], 0, 16)
+    oled.show()
+
 from machine import I2C, Pin
 from ssd1306 import SSD1306_I2C
 from rotary_irq_rp2 import RotaryIRQ
@@ -60,13 +72,14 @@ ENC_SW = 20  # encoder button pin
 btn = Pin(ENC_SW, Pin.IN, Pin.PULL_UP)
 led = Pin("LED", Pin.OUT)
 
-# 1 second hold detection
+# 1 second hold detection; a released button ends it on the first read
 held = True
-for _ in range(10):  # 10×100ms = 1s
-    if btn.value() == 1:
+t0 = time.ticks_ms()
+while time.ticks_diff(time.ticks_ms(), t0) < 1000:
+    if btn.value():
         held = False
         break
-    time.sleep(0.1)
+    time.sleep_ms(100)
 
 if held:
     logger.info("DEBUG: Exited main_async.py early.")
@@ -93,10 +106,10 @@ try:
 
     # Get configuration
     SHTC3_INTERVAL, APC1_INTERVAL, BATTERY_INTERVAL = get_sensor_intervals(settings)
-    DISPLAY_FPS, INPUT_POLL_HZ = get_display_settings(settings)
+    DISPLAY_FPS, _ = get_display_settings(settings)
 
     logger.info(f"Sensors: SHTC3={SHTC3_INTERVAL}s, APC1={APC1_INTERVAL}s, Battery={BATTERY_INTERVAL}s")
-    logger.info(f"Display: {DISPLAY_FPS} FPS, Input: {INPUT_POLL_HZ} Hz")
+    logger.info(f"Display: {DISPLAY_FPS} FPS")
 
     oled = SSD1306_I2C(128, 64, i2c, addr=0x3C)
 
@@ -182,10 +195,7 @@ except Exception as e:
     logger.error("INITIALIZATION ERROR:")
     try:
         if 'oled' in locals():
-            oled.fill(0)
-            oled.text("INIT ERROR", 0, 0)
-            oled.text(str(e)[:20], 0, 16)
-            oled.show()
+            show_error(oled, "INIT ERROR", e)
     except:
         pass
     # Don't auto-reset so we can see the error
@@ -199,21 +209,37 @@ rot = RotaryIRQ(pin_num_clk=ENC_A, pin_num_dt=ENC_B,
                 reverse=True, range_mode=RotaryIRQ.RANGE_UNBOUNDED)
 rot.set(0)
 
+# Set by the encoder listener and the button IRQ; input_task sleeps on it
+_input_event = asyncio.ThreadSafeFlag()
+rot.add_listener(_input_event.set)
+btn.irq(trigger=Pin.IRQ_FALLING, handler=lambda pin: _input_event.set())
+
+# Set by input_task after handling input and by the sensor cache after each
+# update; display_task waits on it between refreshes
+_redraw_event = asyncio.Event()
+cache.on_update = _redraw_event.set
+
+# Set by wake_up(); power_mgmt_task re-arms its idle deadline on it
+_activity_event = asyncio.Event()
+
 # -------- POWER MANAGEMENT --------
-last_activity = time.time()
+# How often to recheck web sessions while they keep an idle APC1 awake
+WEB_RECHECK_MS = 5000
+last_activity = time.ticks_ms()
 display_on = True
 apc1_awake = True
 
 
-def get_idle_time():
-    """Get current idle time in seconds."""
-    return time.time() - last_activity
+def get_idle_ms():
+    """Get current idle time in milliseconds."""
+    return time.ticks_diff(time.ticks_ms(), last_activity)
 
 
 def wake_up(source="physical"):
     """Wake up display and sensors on user activity."""
     global display_on, apc1_awake, last_activity
-    last_activity = time.time()
+    last_activity = time.ticks_ms()
+    _activity_event.set()
     changed = False
 
     # Wake APC1 only if it was asleep
@@ -234,13 +260,25 @@ def wake_up(source="physical"):
 
 # -------- ASYNC TASKS --------
 
+# Fixed show_big() messages, built once instead of per action
+_MSG_SCALES = (1.5, 1)
+_MSG_WIFI_RESET = ("Wi-Fi reset!", "Reboot to setup")
+_MSG_RESET_FAILED = ("Reset failed!", "Try again")
+_MSG_SAVE_FAILED = ("Save failed!", "Try again")
+_MSG_TIMEOUT_NEVER = ("Timeout: Never",)
+
+
 async def display_task():
-    """Async task to update display from cached sensor data or menus."""
+    """Async task to update display from cached sensor data or menus.
+
+    Draws at most DISPLAY_FPS frames per second, and otherwise sleeps until
+    input or new sensor data arrives or the current screen's refresh
+    interval elapses.
+    """
     logger.debug(f"Display task started ({DISPLAY_FPS} FPS)")
     interval_ms = int(1000 / DISPLAY_FPS)
 
     from screens import draw_settings_menu, draw_mode_selection, draw_reset_confirmation, draw_debug_menu, draw_display_settings
-    from config import load_settings, get_operation_mode
 
     # Wait a moment for initialization to complete before first draw
     await asyncio.sleep_ms(100)
@@ -248,93 +286,128 @@ async def display_task():
     # Force initial draw
     screen_mgr.needs_redraw = True
 
+    # Bind hot-loop globals/attributes to locals once
+    _screen_mgr = screen_mgr
+    _oled = oled
+    _cache = cache
+    _sleep_ms = asyncio.sleep_ms
+    _wait_for_ms = asyncio.wait_for_ms
+    _wait = _redraw_event.wait
+
+    # Submenu type -> drawer taking the screen manager
+    _submenu_drawers = {
+        "settings": lambda sm: draw_settings_menu(_oled, sm.submenu_index, sm.scroll_offset),
+        # settings.json only supplies the default mode, so the init-time dict is reused
+        "mode_select": lambda sm: draw_mode_selection(_oled, sm.submenu_index,
+                                                      get_operation_mode(settings)),
+        "reset_confirm": lambda sm: draw_reset_confirmation(_oled, sm.submenu_index),
+        "display_settings": lambda sm: draw_display_settings(_oled, sm.timeout_value,
+                                                             sm.display_timeout_mode,
+                                                             sm.timeout_confirm_index),
+        "debug": lambda sm: draw_debug_menu(_oled, sm.submenu_index),
+    }
+
     while True:
         try:
             # Check if we're in a submenu
-            if screen_mgr.in_submenu:
+            if _screen_mgr.in_submenu:
                 # Draw appropriate submenu
-                if screen_mgr.submenu_type == "settings":
-                    draw_settings_menu(oled, screen_mgr.submenu_index, screen_mgr.scroll_offset)
-                elif screen_mgr.submenu_type == "mode_select":
-                    # Get current mode for display
-                    current_settings = load_settings()
-                    current_mode = get_operation_mode(current_settings)
-                    draw_mode_selection(oled, screen_mgr.submenu_index, current_mode)
-                elif screen_mgr.submenu_type == "reset_confirm":
-                    # Draw reset confirmation
-                    draw_reset_confirmation(oled, screen_mgr.submenu_index)
-                elif screen_mgr.submenu_type == "display_settings":
-                    # Draw display timeout settings with mode
-                    draw_display_settings(oled, screen_mgr.timeout_value,
-                                        screen_mgr.display_timeout_mode,
-                                        screen_mgr.timeout_confirm_index)
-                elif screen_mgr.submenu_type == "debug":
-                    # Draw debug menu
-                    draw_debug_menu(oled, screen_mgr.submenu_index)
+                draw = _submenu_drawers.get(_screen_mgr.submenu_type)
+                if draw:
+                    draw(_screen_mgr)
             else:
-                # Check if immediate redraw needed OR regular refresh interval
-                if screen_mgr.needs_redraw or screen_mgr.should_refresh():
-                    screen_mgr.draw_screen(cache, oled)
-                    screen_mgr.mark_refreshed()
-                    screen_mgr.needs_redraw = False  # Clear the flag
+                # Woken by input, a sensor update or the refresh interval;
+                # draw_screen skips the panel write if nothing changed
+                _screen_mgr.draw_screen(_cache, _oled)
+                _screen_mgr.mark_refreshed()
+                _screen_mgr.needs_redraw = False  # Clear the flag
         except Exception as e:
             logger.error(f"Display error: {e}")
 
-        await asyncio.sleep_ms(interval_ms)
+        # Cap the frame rate, then wait for input or the next scheduled refresh.
+        # Submenus only change on input, so they have no refresh deadline.
+        await _sleep_ms(interval_ms)
+        wait_ms = -1 if _screen_mgr.in_submenu else _screen_mgr.ms_until_next_refresh()
+        if wait_ms != 0 and not _screen_mgr.needs_redraw:
+            try:
+                if wait_ms < 0:
+                    await _wait()
+                else:
+                    await _wait_for_ms(_wait(), wait_ms)
+            except asyncio.TimeoutError:
+                pass
+        _redraw_event.clear()
 
 
 async def input_task():
-    """Async task to handle encoder and button input."""
-    logger.debug(f"Input task started ({INPUT_POLL_HZ} Hz)")
-    interval_ms = int(1000 / INPUT_POLL_HZ)
-    last_encoder_val = rot.value()
+    """Async task to handle encoder and button input.
+
+    Sleeps until the encoder or button interrupt fires instead of polling.
+    """
+    logger.debug("Input task started (interrupt-driven)")
+    # Bind hot-loop globals/attributes to locals once
+    _screen_mgr = screen_mgr
+    _oled = oled
+    _cache = cache
+    _rot_value = rot.value
+    _btn_value = btn.value
+    _sleep_ms = asyncio.sleep_ms
+    _wait = _input_event.wait
+
+    last_encoder_val = _rot_value()
 
     while True:
+        await _wait()
         try:
             # Check encoder
-            current_val = rot.value()
+            current_val = _rot_value()
             if current_val != last_encoder_val:
                 wake_up("physical")  # <-- MODIFIED FOR WEBSERVER
 
                 # Handle encoder rotation based on current state
-                if screen_mgr.in_submenu:
+                if _screen_mgr.in_submenu:
                     # Check if in display settings
-                    if screen_mgr.submenu_type == "display_settings":
-                        if screen_mgr.display_timeout_mode == "adjusting":
+                    if _screen_mgr.submenu_type == "display_settings":
+                        if _screen_mgr.display_timeout_mode == "adjusting":
                             # Adjusting mode: modify timeout value
                             if current_val > last_encoder_val:
-                                screen_mgr.adjust_timeout_up()
+                                _screen_mgr.adjust_timeout_up()
                             else:
-                                screen_mgr.adjust_timeout_down()
+                                _screen_mgr.adjust_timeout_down()
                         else:
                             # Confirming mode: toggle between Save/Cancel
                             if current_val > last_encoder_val:
-                                screen_mgr.timeout_confirm_index = (screen_mgr.timeout_confirm_index + 1) % 2
+                                _screen_mgr.timeout_confirm_index = (_screen_mgr.timeout_confirm_index + 1) % 2
                             else:
-                                screen_mgr.timeout_confirm_index = (screen_mgr.timeout_confirm_index - 1) % 2
+                                _screen_mgr.timeout_confirm_index = (_screen_mgr.timeout_confirm_index - 1) % 2
                         # Display settings will be redrawn by display_task
                     else:
                         # Navigate menu items
                         if current_val > last_encoder_val:
-                            screen_mgr.next_menu_item()
+                            _screen_mgr.next_menu_item()
                         else:
-                            screen_mgr.prev_menu_item()
+                            _screen_mgr.prev_menu_item()
                         # Menu will be redrawn by display_task
                 else:
                     # Navigate main screens
                     if current_val > last_encoder_val:
-                        screen_mgr.next_screen()
+                        _screen_mgr.next_screen()
                     else:
-                        screen_mgr.prev_screen()
+                        _screen_mgr.prev_screen()
                     # Draw screen immediately
-                    screen_mgr.draw_screen(cache, oled)
+                    _screen_mgr.draw_screen(_cache, _oled)
 
                 last_encoder_val = current_val
 
-            # Check button
-            if not btn.value():  # Active low
+            # Check button (active low); re-sample after a short settle so
+            # release bounce edges don't register as presses
+            pressed = not _btn_value()
+            if pressed:
+                await _sleep_ms(10)
+                pressed = not _btn_value()
+            if pressed:
                 wake_up("physical")  # <-- MODIFIED FOR WEBSERVER
-                action = screen_mgr.handle_button()
+                action = _screen_mgr.handle_button()
 
                 # Handle menu actions
                 if action:
@@ -345,11 +418,11 @@ async def input_task():
                             # Reset WiFi (write to wifi.json only)
                             from wifi_config import reset_wifi
                             if reset_wifi():
-                                show_big(oled, ["Wi-Fi reset!", "Reboot to setup"], [1.5, 1])
+                                show_big(_oled, _MSG_WIFI_RESET, _MSG_SCALES)
                                 await asyncio.sleep(2)
                                 machine.reset()
                             else:
-                                show_big(oled, ["Reset failed!", "Try again"], [1.5, 1])
+                                show_big(_oled, _MSG_RESET_FAILED, _MSG_SCALES)
                                 await asyncio.sleep(2)
 
                         elif action_type == "set_mode":
@@ -357,32 +430,32 @@ async def input_task():
                             from runtime_state import set_mode
                             new_mode = action.get("mode", "mobile")
                             if set_mode(new_mode):
-                                show_big(oled, [f"Mode: {new_mode.upper()}", "Reboot to apply"], [1.5, 1])
+                                show_big(_oled, (f"Mode: {new_mode.upper()}", "Reboot to apply"), _MSG_SCALES)
                                 logger.info(f"Mode set to: {new_mode}")
                                 await asyncio.sleep(2)
                                 machine.reset()
                             else:
-                                show_big(oled, ["Save failed!", "Try again"], [1.5, 1])
+                                show_big(_oled, _MSG_SAVE_FAILED, _MSG_SCALES)
                                 await asyncio.sleep(2)
 
                         elif action_type == "timeout_saved":
                             # Timeout was saved, show confirmation briefly
                             timeout_val = action.get("value", 0)
                             if timeout_val == 0:
-                                show_big(oled, ["Timeout: Never"], [1.5])
+                                show_big(_oled, _MSG_TIMEOUT_NEVER, _MSG_SCALES)
                             else:
-                                show_big(oled, [f"Timeout: {timeout_val}s"], [1.5])
+                                show_big(_oled, (f"Timeout: {timeout_val}s",), _MSG_SCALES)
                             await asyncio.sleep(1)
                             # Reset idle timer to apply new timeout immediately
                             wake_up("physical")  # <-- MODIFIED FOR WEBSERVER
 
                         elif action_type == "exit_program":
                             # Exit program gracefully via KeyboardInterrupt
-                            oled.fill(0)
-                            oled.text("Exiting...", 30, 20)
-                            oled.text("Connect to", 20, 32)
-                            oled.text("Thonny now", 20, 44)
-                            oled.show()
+                            _oled.fill(0)
+                            _oled.text("Exiting...", 30, 20)
+                            _oled.text("Connect to", 20, 32)
+                            _oled.text("Thonny now", 20, 44)
+                            _oled.show()
                             logger.debug("Exiting program gracefully")
                             await asyncio.sleep(1)
                             raise KeyboardInterrupt
@@ -391,22 +464,25 @@ async def input_task():
                     elif action == "resetwifi":
                         from wifi_config import reset_wifi
                         if reset_wifi():
-                            show_big(oled, ["Wi-Fi reset!", "Reboot to setup"], [1.5, 1])
+                            show_big(_oled, _MSG_WIFI_RESET, _MSG_SCALES)
                             await asyncio.sleep(2)
                             machine.reset()
 
                 # Debounce delay
-                await asyncio.sleep_ms(200)
+                await _sleep_ms(200)
 
         except Exception as e:
             logger.error(f"Input error: {e}")
 
-        await asyncio.sleep_ms(interval_ms)
+        _redraw_event.set()
 
 
 async def power_mgmt_task(webserver_sessions=None):
     """Async task to manage power states based on inactivity with web awareness.
-    
+
+    Sleeps until the idle deadline or the next wake_up() instead of polling,
+    so an idle device does no periodic work here.
+
     Args:
         webserver_sessions: WebSessionManager instance for web presence detection
     """
@@ -417,44 +493,48 @@ async def power_mgmt_task(webserver_sessions=None):
     timeout_str = "Never" if screen_timeout == 0 else f"{screen_timeout}s"
     logger.debug(f"Power mgmt started (timeout: {timeout_str})")
 
+    _wait = _activity_event.wait
+    _wait_for_ms = asyncio.wait_for_ms
+
     while True:
+        wait_ms = -1  # Wait for activity only
         try:
             # Get current timeout (may have changed via settings)
             screen_timeout = get_screen_timeout()
-            idle_time = get_idle_time()
-
-            # Check for active web sessions (if webserver is running)
-            web_active = False
-            if webserver_sessions:
-                web_active = webserver_sessions.has_active_sessions()
-
-            # Display power management (unchanged)
-            if screen_timeout > 0 and display_on and idle_time > screen_timeout:
-                oled.poweroff()
-                display_on = False
-                logger.debug("Display off")
-
-            # APC1 power management (enhanced for web awareness)
-            operation_mode = get_operation_mode(settings)
-            if operation_mode == "mobile":
-                # In mobile mode, consider web activity
-                effective_idle = 0 if web_active else idle_time
-
-                if screen_timeout > 0 and apc1_awake and effective_idle > screen_timeout:
-                    apc1_power.disable()
-                    apc1_awake = False
-                    logger.debug("APC1 sleep (mobile mode)")
-                elif not apc1_awake and (web_active or effective_idle <= screen_timeout):
-                    apc1_power.enable()
-                    apc1_awake = True
-                    logger.debug("APC1 wake (web/mobile activity)")
-            # In station mode, APC1 is managed by apc1_station_mode_task
+            remaining_ms = screen_timeout * 1000 - get_idle_ms()
+
+            if screen_timeout > 0 and remaining_ms > 0:
+                # Not idle yet: sleep until the deadline
+                wait_ms = remaining_ms
+            elif screen_timeout > 0:
+                # Display power management (unchanged)
+                if display_on:
+                    oled.poweroff()
+                    display_on = False
+                    logger.debug("Display off")
+
+                # APC1 power management (mobile mode only); in station mode,
+                # APC1 is managed by apc1_station_mode_task
+                if apc1_awake and get_operation_mode(settings) == "mobile":
+                    if webserver_sessions and webserver_sessions.has_active_sessions():
+                        # Keep APC1 up for the web dashboard; recheck shortly
+                        wait_ms = WEB_RECHECK_MS
+                    else:
+                        apc1_power.disable()
+                        apc1_awake = False
+                        logger.debug("APC1 sleep (mobile mode)")
 
         except Exception as e:
             logger.error(f"Power mgmt error: {e}")
 
-        # Check power state every 5 seconds
-        await asyncio.sleep(5)
+        try:
+            if wait_ms < 0:
+                await _wait()
+            else:
+                await _wait_for_ms(_wait(), wait_ms)
+        except asyncio.TimeoutError:
+            pass
+        _activity_event.clear()
 
 
 async def screen_update_task():
@@ -574,6 +654,11 @@ async def ntp_mqtt_recovery_task():
             logger.error(f"Recovery task error: {e}")
 
 
+def _task_error(loop, context):
+    """Event loop exception handler: log a task that died unexpectedly."""
+    logger.error(f"Task died: {context.get('exception')}")
+
+
 async def main():
     """Main async coordinator - starts all tasks.
 
@@ -749,9 +834,8 @@ async def main():
             # Start the webserver
             async def webserver_runner():
                 await webserver.start()
-                # Keep running
-                while webserver.running:
-                    await asyncio.sleep(1)
+                # Keep running until the server is stopped
+                await webserver.wait_stopped()
             
             tasks.append(asyncio.create_task(webserver_runner()))
             logger.info("  Webserver task added")
@@ -768,9 +852,10 @@ async def main():
     logger.debug(f"Started {len(tasks)} async tasks")
     logger.debug("=== System Running ===")
 
-    # Wait for all tasks (they run forever)
-    # Each task has its own error handling - main loop never crashes
-    await asyncio.gather(*tasks)
+    # Tasks run forever on their own; rather than gathering them, park here
+    # and log any task that dies so the others keep running
+    asyncio.get_event_loop().set_exception_handler(_task_error)
+    await asyncio.Event().wait()
 
 
 # -------- ENTRY POINT --------
@@ -783,10 +868,7 @@ except KeyboardInterrupt:
     oled.show()
     logger.info("Stopped by user")
 except Exception as e:
-    oled.fill(0)
-    oled.text("ERROR", 0, 0)
-    oled.text(str(e)[:20], 0, 16)
-    oled.show()
+    show_error(oled, "ERROR", e)
     logger.error(f"Fatal error: {e}")
     time.sleep(5)
     machine.reset()
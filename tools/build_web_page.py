@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Build the gzip-compressed dashboard page served by the webserver.
+
+Renders lib/web_page.py on the host and writes www/index.html.gz, which
+must be copied to the Pico alongside lib/. The webserver streams it from
+flash with Content-Encoding: gzip instead of keeping the page in RAM.
+
+The auto-refresh interval is baked into the page, so re-run this after
+changing webserver.refresh_interval_s.
+
+Usage:
+    python3 tools/build_web_page.py [refresh_interval_s]
+"""
+
+import gzip
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT_PATH = os.path.join(ROOT, "www", "index.html.gz")
+DEFAULT_REFRESH_S = 20
+
+sys.path.insert(0, os.path.join(ROOT, "lib"))
+from web_page import build_html  # noqa: E402
+
+
+def get_refresh_interval():
+    """Return refresh interval from argv, settings.json or the example."""
+    if len(sys.argv) > 1:
+        return int(sys.argv[1])
+    for name in ("settings.json", "settings.json.example"):
+        try:
+            with open(os.path.join(ROOT, name)) as f:
+                settings = json.load(f)
+            return settings.get("webserver", {}).get("refresh_interval_s", DEFAULT_REFRESH_S)
+        except (OSError, ValueError):
+            continue
+    return DEFAULT_REFRESH_S
+
+
+def main():
+    refresh_interval = get_refresh_interval()
+    html = build_html(refresh_interval).encode("utf-8")
+
+    os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
+    # mtime=0 keeps the output byte-identical between builds
+    with open(OUT_PATH, "wb") as f:
+        f.write(gzip.compress(html, compresslevel=9, mtime=0))
+
+    size = os.path.getsize(OUT_PATH)
+    print(f"Wrote {OUT_PATH}: {len(html)} -> {size} bytes (refresh {refresh_interval}s)")
+
+
+if __name__ == "__main__":
+    main()
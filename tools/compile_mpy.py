@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Precompile lib/ modules to MicroPython bytecode (.mpy).
+
+Writes build/lib/*.mpy (mirroring lib/, including subpackages) using
+mpy-cross. Uploading these in place of the .py sources means the Pico
+no longer parses and compiles every module at boot, which lowers the
+peak heap use during import. boot.py and main.py stay as .py since
+MicroPython only runs those by source name.
+
+mpy-cross must match the firmware's bytecode version
+(pip install mpy-cross==<firmware version>).
+
+Usage:
+    python3 tools/compile_mpy.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT, "lib")
+OUT_DIR = os.path.join(ROOT, "build", "lib")
+
+
+def find_mpy_cross():
+    """Return the mpy-cross command, preferring the executable on PATH."""
+    exe = shutil.which("mpy-cross")
+    if exe:
+        return [exe]
+    return [sys.executable, "-m", "mpy_cross"]
+
+
+def main():
+    cmd = find_mpy_cross()
+    count = 0
+    for dirpath, _, filenames in os.walk(SRC_DIR):
+        rel = os.path.relpath(dirpath, SRC_DIR)
+        out_dir = os.path.normpath(os.path.join(OUT_DIR, rel))
+        for name in sorted(filenames):
+            if not name.endswith(".py"):
+                continue
+            os.makedirs(out_dir, exist_ok=True)
+            src = os.path.join(dirpath, name)
+            out = os.path.join(out_dir, name[:-3] + ".mpy")
+            subprocess.run(cmd + ["-o", out, src], check=True)
+            count += 1
+
+    print(f"Compiled {count} modules into {OUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()